@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Formatter Benchmark
+Compares the vectorized DD-Mon-YYYY formatter with pandas strftime.
+
+Usage: python benchmarks/bench_format.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import converter_core as core
+
+
+def best_of(repeat, func):
+    """Run func repeat times and return (best seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="samples to format (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per method, best is reported (default: %(default)s)")
+    args = parser.parse_args()
+
+    # 2-second samples, as written by a typical OPC export
+    parsed = pd.Series(pd.date_range("2025-12-01", periods=args.rows, freq="2s").as_unit("ns"))
+
+    strftime_time, expected = best_of(args.repeat, lambda: parsed.dt.strftime(core.PI_FORMAT))
+    fast_time, formatted = best_of(args.repeat, lambda: core.format_pi_timestamps(parsed))
+
+    if not (expected == formatted).all():
+        print("ERROR: formatter output differs from strftime", file=sys.stderr)
+        return 1
+
+    print(f"{'rows:':24}{args.rows:,}")
+    print(f"{'strftime:':24}{strftime_time:8.3f} s  ({args.rows / strftime_time:,.0f} rows/s)")
+    print(f"{'format_pi_timestamps:':24}{fast_time:8.3f} s  ({args.rows / fast_time:,.0f} rows/s)")
+    print(f"{'speedup:':24}{strftime_time / fast_time:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures time-to-first-window and time-to-first-conversion from a cold interpreter.
+
+Each probe runs in a fresh Python process and is timed from launch: the
+GUI probe opens the main window and then loads and converts a synthetic
+export the way Upload + Apply do; the CLI probe converts the same file in
+batch mode. The parse cache is bypassed so every run parses the CSV.
+
+Usage: python benchmarks/bench_startup.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import synthetic
+
+# Runs in the child; prints a line as each milestone is reached
+GUI_PROBE = """
+import sys
+sys.path.insert(0, {repo!r})
+import tkinter as tk
+import timestamp_converter as app_module
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print("window unavailable", flush=True)
+else:
+    app = app_module.TimestampConverterApp(root)
+    root.update()
+    print("window", flush=True)
+core = app_module.load_core()
+df = core.load_files([{path!r}])
+core.convert_frame(df, core.ConversionOptions(hour_offset=-5), ordered=True)
+print("conversion", flush=True)
+"""
+
+
+def run_probe(command):
+    """Launch command and return {milestone: seconds since launch} from its output lines."""
+    milestones = {}
+    start = time.perf_counter()
+    with subprocess.Popen(command, stdout=subprocess.PIPE, text=True, cwd=REPO_DIR) as process:
+        for line in process.stdout:
+            milestones[line.strip()] = time.perf_counter() - start
+    milestones["exit"] = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(command[:2])} exited with {process.returncode}")
+    return milestones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000, help="rows in the converted file (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="launches per probe, median is reported (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, "export.csv")
+        synthetic.generate_frame(args.rows).to_csv(input_path, index=False, header=False)
+
+        probes = {
+            "interpreter": [sys.executable, "-c", "pass"],
+            "gui": [sys.executable, "-c", GUI_PROBE.format(repo=REPO_DIR, path=input_path)],
+            "cli": [sys.executable, os.path.join(REPO_DIR, "timestamp_converter.py"), input_path,
+                    "-o", work_dir, "-j", "1"],
+        }
+        samples = {}
+        for name, command in probes.items():
+            for _ in range(args.repeat):
+                for milestone, seconds in run_probe(command).items():
+                    samples.setdefault((name, milestone), []).append(seconds)
+
+    rows = [
+        ("python startup", ("interpreter", "exit")),
+        ("GUI first window", ("gui", "window")),
+        ("GUI first conversion", ("gui", "conversion")),
+        ("CLI first conversion", ("cli", "exit")),
+    ]
+    print(f"{'rows:':24}{args.rows:,}")
+    for label, key in rows:
+        if key in samples:
+            print(f"{label + ':':24}{statistics.median(samples[key]):8.3f} s")
+        else:
+            print(f"{label + ':':24}{'n/a':>8}   (no display)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
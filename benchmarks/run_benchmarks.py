@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks
+Times each conversion stage on synthetic OPC exports and records the results.
+
+Each run is appended to benchmarks/results.jsonl together with the git
+revision and dataset parameters, and compared with the previous run that used
+the same parameters so regressions stand out between versions.
+
+Usage: python benchmarks/run_benchmarks.py --rows 1000000 --duplicates 0.05
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import pandas as pd
+import converter_core as core
+import synthetic
+
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.jsonl")
+REGRESSION_THRESHOLD = 1.2  # Flag stages at least 20% slower than last time
+
+
+def git_revision():
+    """Return the current commit hash (with -dirty), or "unknown"."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=BENCH_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def timed(results, name, rows_in, func):
+    """Run func, record its wall time under name, and return its result."""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    rows_out = len(result) if hasattr(result, "__len__") else rows_in
+    results.append({"stage": name, "seconds": round(elapsed, 4), "rows_in": rows_in, "rows_out": rows_out})
+    return result
+
+
+def run_stages(input_path, output_path, options):
+    """Time load, each pipeline stage, save and a streaming end-to-end run."""
+    results = []
+    df = timed(results, "load", 0, lambda: core.load_files([input_path]))
+
+    stats = core.ConversionStats()
+    frame = df
+    for key, stage in core.pipeline_stages(options, ordered=True):
+        if stage is None:
+            continue
+        frame = timed(results, key[0], len(frame), lambda: pd.concat(
+            list(stage(core.iter_frame_chunks(frame), stats)), ignore_index=True
+        ))
+    converted = timed(results, "finalize", len(frame), lambda: pd.concat(
+        list(core.finalize([frame], options)), ignore_index=True
+    ))
+    timed(results, "save", len(converted), lambda: core.write_chunks(
+        core.iter_frame_chunks(converted), output_path, options.encoding
+    ))
+
+    stream_stats = timed(results, "stream_total", 0, lambda: core.convert_files([input_path], output_path, options))
+    results[-1]["rows_in"], results[-1]["rows_out"] = stream_stats.rows_in, stream_stats.rows_out
+    return results
+
+
+def previous_run(params):
+    """Return the most recent recorded run with the same parameters, if any."""
+    if not os.path.exists(RESULTS_PATH):
+        return None
+    previous = None
+    with open(RESULTS_PATH, encoding="utf-8") as handle:
+        for line in handle:
+            run = json.loads(line)
+            if run.get("params") == params:
+                previous = run
+    return previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each conversion stage on synthetic OPC data.")
+    synthetic.add_arguments(parser)
+    parser.add_argument("--offset", type=int, default=-5, help="hour offset applied (default: %(default)s)")
+    parser.add_argument("--no-save", action="store_true", help=f"do not append results to {RESULTS_PATH}")
+    args = parser.parse_args()
+
+    params = dict(synthetic.generator_kwargs(args), rows=args.rows, offset=args.offset)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, "export.csv")
+        output_path = os.path.join(work_dir, "converted.csv")
+        print(f"Generating {args.rows:,} rows...")
+        frame = synthetic.generate_frame(args.rows, **synthetic.generator_kwargs(args))
+        frame.to_csv(input_path, index=False, header=False)
+
+        # Filter to the middle of the generated span so the range stage has work to do
+        first = pd.Timestamp("2025-12-03 05:28:11") + timedelta(hours=args.offset)
+        span = timedelta(seconds=args.rows * args.interval)
+        options = core.ConversionOptions(
+            hour_offset=args.offset,
+            tagname="BENCH_TAG",
+            remove_bad_quality=True,
+            remove_duplicates=True,
+            start=(first + span / 4).to_pydatetime(),
+            end=(first + span * 3 / 4).to_pydatetime(),
+        )
+        results = run_stages(input_path, output_path, options)
+
+    run = {
+        "revision": git_revision(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "params": params,
+        "stages": results,
+    }
+    previous = previous_run(params)
+    before = {stage["stage"]: stage["seconds"] for stage in previous["stages"]} if previous else {}
+
+    print(f"\n{'stage':<14}{'seconds':>10}{'rows in':>12}{'rows out':>12}   vs {previous['revision'] if previous else '-'}")
+    for stage in results:
+        change = ""
+        if before.get(stage["stage"]):
+            ratio = stage["seconds"] / before[stage["stage"]]
+            change = f"{ratio:6.2f}x" + ("  REGRESSION" if ratio >= REGRESSION_THRESHOLD else "")
+        print(f"{stage['stage']:<14}{stage['seconds']:>10.3f}{stage['rows_in']:>12,}{stage['rows_out']:>12,}   {change}")
+
+    if not args.no_save:
+        with open(RESULTS_PATH, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(run) + "\n")
+        print(f"\nResults appended to {RESULTS_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Synthetic OPC Export Generator
+Writes realistic OPC server exports (Timestamp,Value,Quality) for benchmarks.
+
+Rows look like: 12/3/2025 5:28:11 AM.7480000,651.261902,0x400c0
+
+Usage: python benchmarks/synthetic.py out.csv --rows 1000000 --bad-quality 0.02
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+GOOD_QUALITY = "0x400c0"
+BAD_QUALITY = "0x100400c0"
+
+
+def generate_frame(rows, start="2025-12-03 05:28:11", interval=2.0, bad_quality=0.01,
+                   duplicates=0.0, unsorted=0.0, malformed=0.0, seed=0):
+    """Build a synthetic OPC export as a Timestamp/Value/Quality frame.
+
+    interval: seconds between samples (with +/-10% jitter)
+    bad_quality: share of rows flagged 0x100400c0
+    duplicates: share of rows repeating the previous row's second
+    unsorted: share of rows swapped with a random other row
+    malformed: share of rows with an unparseable timestamp
+    """
+    rng = np.random.default_rng(seed)
+
+    steps = rng.uniform(0.9, 1.1, rows) * interval * 1e9
+    steps[rng.random(rows) < duplicates] = 0
+    nanos = pd.Timestamp(start).value + np.cumsum(steps).astype("int64")
+
+    if unsorted > 0:
+        swaps = np.flatnonzero(rng.random(rows) < unsorted)
+        targets = rng.integers(0, rows, len(swaps))
+        nanos[swaps], nanos[targets] = nanos[targets], nanos[swaps].copy()
+
+    times = pd.DatetimeIndex(nanos)
+    hours = times.hour.to_numpy()
+    hour12 = np.where(hours % 12 == 0, 12, hours % 12)
+    fraction = (times.microsecond.to_numpy() * 10 + times.nanosecond.to_numpy() // 100).astype("int64")
+    timestamps = (
+        pd.Series(times.month.astype(str)) + "/" + times.day.astype(str) + "/" + times.year.astype(str)
+        + " " + pd.Series(hour12).astype(str) + ":" + pd.Series(times.minute).astype(str).str.zfill(2)
+        + ":" + pd.Series(times.second).astype(str).str.zfill(2)
+        + np.where(hours < 12, " AM.", " PM.") + pd.Series(fraction).astype(str).str.zfill(7)
+    )
+    bad_rows = rng.random(rows) < malformed
+    if bad_rows.any():
+        timestamps[bad_rows] = "##ERROR##"
+
+    # Slow random walk around a process value, rounded like OPC output
+    values = np.round(650 + np.cumsum(rng.normal(0, 0.05, rows)), 6)
+    quality = np.where(rng.random(rows) < bad_quality, BAD_QUALITY, GOOD_QUALITY)
+
+    return pd.DataFrame({"Timestamp": timestamps, "Value": values, "Quality": quality})
+
+
+def write_export(path, rows, **kwargs):
+    """Write a synthetic OPC export to path (no header). Returns the path."""
+    generate_frame(rows, **kwargs).to_csv(path, index=False, header=False)
+    return path
+
+
+def add_arguments(parser):
+    """Add the generator options to an argument parser."""
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to generate (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between samples (default: %(default)s)")
+    parser.add_argument("--bad-quality", type=float, default=0.01, help="share of 0x100400c0 rows (default: %(default)s)")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="share of duplicate-second rows (default: %(default)s)")
+    parser.add_argument("--unsorted", type=float, default=0.0, help="share of out-of-order rows (default: %(default)s)")
+    parser.add_argument("--malformed", type=float, default=0.0, help="share of unparseable timestamps (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+
+
+def generator_kwargs(args):
+    """Map parsed arguments onto generate_frame() keyword arguments."""
+    return {
+        "interval": args.interval,
+        "bad_quality": args.bad_quality,
+        "duplicates": args.duplicates,
+        "unsorted": args.unsorted,
+        "malformed": args.malformed,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic OPC server export.")
+    parser.add_argument("output", help="CSV file to write")
+    add_arguments(parser)
+    args = parser.parse_args()
+    write_export(args.output, args.rows, **generator_kwargs(args))
+    print(f"Wrote {args.rows:,} rows to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1481 @@
+#!/usr/bin/env python3
+"""
+Conversion Engine
+Tk-free core that converts OPC server exports to PI tag import format.
+
+The pipeline is a chain of generators working on fixed-size chunks:
+read -> bad-quality filter -> parse/offset -> range filter -> dedupe -> format -> write.
+The GUI runs it over a single in-memory frame; batch entry points stream
+files through it so memory stays constant regardless of file size.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+try:
+    # Optional: multi-threaded whole-file CSV reads
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+try:
+    # Optional: current memory use for stage instrumentation
+    import psutil
+    _process = psutil.Process()
+except ImportError:
+    _process = None
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows without psutil: memory is not reported
+
+OPC_COLUMNS = ["Timestamp", "Value", "Quality"]
+# Explicit dtypes for the fixed OPC layout: quality codes repeat, so a
+# category stores each row as a small integer code
+OPC_DTYPES = {"Timestamp": str, "Value": "float64", "Quality": "category"}
+BAD_QUALITY = "0x100400c0"
+BAD_QUALITY_CODE = int(BAD_QUALITY, 16)
+OPC_FORMAT = "%m/%d/%Y %I:%M:%S %p"
+PI_FORMAT = "%d-%b-%Y %H:%M:%S"
+ENCODINGS = {"ANSI": "cp1252", "UTF-8": "utf-8"}
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+WRITE_BUFFER_BYTES = 4 * 1024 * 1024
+# Environment variables that turn on instrumentation output: a JSON-lines
+# file each run's stage timings are appended to, and a directory for
+# cProfile dumps
+STATS_LOG_ENV = "TIMESTAMP_CONVERTER_STATS_LOG"
+PROFILE_DIR_ENV = "TIMESTAMP_CONVERTER_PROFILE_DIR"
+# Bump whenever read/parse/compact output changes so stale parse caches are ignored
+PARSER_VERSION = 1
+DEFAULT_PARSE_CACHE_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_PARSE_CACHE_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "timestamp_converter",
+)
+# Distinct timestamps remembered when deduping input that is not time-ordered
+DEDUPE_WINDOW = 1_000_000
+# Downsampling: per-interval aggregates, then value-based compression filters
+BUCKET_METHODS = ["first", "last", "mean", "min", "max", "minmax"]
+COMPRESSION_METHODS = ["deadband", "swinging-door"]
+DOWNSAMPLE_METHODS = BUCKET_METHODS + COMPRESSION_METHODS
+
+# Internal column holding parsed datetime64 values alongside the raw data.
+# Loaded frames carry the full-precision source time; after the parse/offset
+# stage it holds the shifted time truncated to whole seconds (as written).
+PARSED = "Parsed"
+NAT_NANOS = pd.NaT.value
+
+NANOS_PER_SECOND = 1_000_000_000
+SECONDS_PER_DAY = 86_400
+MONTH_ABBRS = np.array([b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun",
+                        b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec"])
+_time_of_day_table = None  # "HH:MM:SS" bytes for every second of a day, built on first use
+
+
+class ConversionCancelled(Exception):
+    """Raised inside a running stage when the caller's cancel event is set."""
+
+
+def _report(progress, cancel, done, total):
+    """Raise if cancelled, then pass (done, total) to the progress callback."""
+    if cancel is not None and cancel.is_set():
+        raise ConversionCancelled()
+    if progress is not None:
+        progress(done, total)
+
+
+class UnsortedInput(Exception):
+    """Raised by a merge source whose rows turn out not to be in time order."""
+
+    def __init__(self, source):
+        super().__init__(f"{source} is not in time order")
+        self.source = source
+
+
+class ConversionOptions:
+    """Conversion settings shared by the GUI and batch entry points."""
+
+    def __init__(self, hour_offset=0, tagname=None, remove_bad_quality=False,
+                 remove_duplicates=False, start=None, end=None, encoding="cp1252",
+                 downsample=None, downsample_seconds=None, deviation=None):
+        self.hour_offset = hour_offset
+        self.tagname = tagname
+        self.remove_bad_quality = remove_bad_quality
+        self.remove_duplicates = remove_duplicates
+        self.start = start
+        self.end = end
+        self.encoding = encoding
+        # One of DOWNSAMPLE_METHODS or None; see check_downsample()
+        self.downsample = downsample
+        self.downsample_seconds = downsample_seconds
+        self.deviation = deviation
+
+    def copy(self, **changes):
+        """Return a copy with the given settings replaced, e.g. copy(tagname="T1")."""
+        other = ConversionOptions()
+        other.__dict__.update(self.__dict__)
+        other.__dict__.update(changes)
+        return other
+
+
+class ConversionStats:
+    """Row counters collected while the pipeline runs."""
+
+    def __init__(self):
+        self.rows_in = 0
+        self.rows_out = 0
+        self.bad_quality_removed = 0
+        self.rows_filtered = 0
+        self.duplicates_removed = 0
+        self.rows_downsampled = 0
+        self.stages = []  # StageTiming per stage, in pipeline order
+
+    def summary(self, hour_offset=0):
+        """Describe the run, e.g. "120 rows converted (offset: -5h), 3 duplicates removed"."""
+        offset_msg = f" (offset: {hour_offset:+d}h)" if hour_offset != 0 else ""
+        bad_msg = f", {self.bad_quality_removed} bad quality removed" if self.bad_quality_removed > 0 else ""
+        filter_msg = f", {self.rows_filtered} rows filtered out" if self.rows_filtered > 0 else ""
+        dup_msg = f", {self.duplicates_removed} duplicates removed" if self.duplicates_removed > 0 else ""
+        down_msg = f", {self.rows_downsampled} removed by downsampling" if self.rows_downsampled > 0 else ""
+        return f"{self.rows_out} rows converted{offset_msg}{bad_msg}{filter_msg}{dup_msg}{down_msg}"
+
+    def copy(self):
+        """Return an independent copy of the counters."""
+        other = ConversionStats()
+        other.__dict__.update(self.__dict__)
+        other.stages = list(self.stages)
+        return other
+
+    def add(self, other):
+        """Add another run's counters and stage timings (summed per stage name) to these."""
+        for name, value in other.counters().items():
+            setattr(self, name, getattr(self, name) + value)
+        totals = {timing.name: timing for timing in self.stages}
+        for timing in other.stages:
+            total = totals.get(timing.name)
+            if total is None:
+                total = totals[timing.name] = StageTiming(timing.name)
+                self.stages.append(total)
+            total.seconds += timing.seconds
+            total.rows_in += timing.rows_in
+            total.rows_out += timing.rows_out
+            if timing.peak_bytes is not None:
+                total.peak_bytes = max(total.peak_bytes or 0, timing.peak_bytes)
+
+    def counters(self):
+        """Row counters as a dict, e.g. for log_stats()."""
+        return {name: value for name, value in self.__dict__.items() if name != "stages"}
+
+
+class StageTiming:
+    """Wall time, row counts and peak memory of one pipeline stage."""
+
+    def __init__(self, name, seconds=0.0, rows_in=0, rows_out=0, peak_bytes=None):
+        self.name = name
+        self.seconds = seconds
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+        self.peak_bytes = peak_bytes
+
+    def stop(self, start, rows_out):
+        """Finish a stage that began at time.perf_counter() value start."""
+        self.seconds = time.perf_counter() - start
+        self.rows_out = rows_out
+        self.note_memory()
+
+    def note_memory(self):
+        """Raise peak_bytes to the current process memory use, if it can be measured."""
+        current = memory_bytes()
+        if current is not None and (self.peak_bytes is None or current > self.peak_bytes):
+            self.peak_bytes = current
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+def memory_bytes():
+    """Resident memory of this process in bytes, or None if it can't be measured.
+
+    Uses psutil when installed; otherwise the process's peak resident size
+    from getrusage(), so later stages report at least the earlier peak.
+    """
+    if _process is not None:
+        return _process.memory_info().rss
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+def timed_stage(chunks, timing):
+    """Pass chunks through, adding their row count and production time to timing.
+
+    The time includes every upstream stage, since chunks are pulled through
+    the whole generator chain; exclusive_times() separates them afterwards.
+    """
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            timing.seconds += time.perf_counter() - start
+            return
+        timing.seconds += time.perf_counter() - start
+        timing.rows_out += len(chunk)
+        timing.note_memory()
+        yield chunk
+
+
+def exclusive_times(timings):
+    """Turn the inclusive times of a chain of timed_stage()s into per-stage times.
+
+    Also fills in each stage's rows_in from the stage before it.
+    """
+    for index in range(len(timings) - 1, 0, -1):
+        timings[index].seconds = max(0.0, timings[index].seconds - timings[index - 1].seconds)
+        timings[index].rows_in = timings[index - 1].rows_out
+
+
+def timing_summary(timings, top=3):
+    """One-line summary: total time, the slowest stages and the peak memory."""
+    if not timings:
+        return ""
+    total = sum(timing.seconds for timing in timings)
+    slowest = sorted(timings, key=lambda timing: timing.seconds, reverse=True)[:top]
+    parts = ", ".join(f"{timing.name} {timing.seconds:.2f}s" for timing in slowest)
+    peaks = [timing.peak_bytes for timing in timings if timing.peak_bytes is not None]
+    peak_msg = f", peak {max(peaks) / 2**20:.0f} MB" if peaks else ""
+    return f"{total:.2f}s: {parts}{peak_msg}"
+
+
+def log_stats(log_path, action, stages, **fields):
+    """Append one JSON line describing a run (extra fields and stage timings) to log_path."""
+    record = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "action": action,
+        **fields,
+        "stages": [timing.as_dict() for timing in stages],
+    }
+    with open(log_path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record) + "\n")
+
+
+def frame_bytes(df, sample_rows=1000):
+    """Estimate a frame's memory use without a full deep scan.
+
+    Object/string columns are sized from a sample of rows; a deep
+    memory_usage() call would visit every Python object.
+    """
+    total = int(df.memory_usage(index=True, deep=False).sum())
+    if len(df) > 0:
+        sample = df.iloc[:: max(1, len(df) // sample_rows)]
+        for col in df.columns:
+            if df[col].dtype == object or pd.api.types.is_string_dtype(df[col].dtype):
+                per_row = sample[col].memory_usage(index=False, deep=True) / len(sample)
+                total += int(per_row * len(df))
+    return total
+
+
+class StageCache:
+    """LRU cache of intermediate pipeline frames, bounded by estimated memory.
+
+    Keys describe the source frame and every option an output depends on, so
+    re-applying with only late-stage options changed resumes from the deepest
+    cached stage. Least recently used entries are evicted past max_bytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Return the cached (frame, stats) for key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], entry[1]
+
+    def put(self, key, frame, stats):
+        """Store a stage output, evicting old entries to stay under max_bytes."""
+        size = frame_bytes(frame)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[2]
+        self._entries[key] = (frame, stats.copy(), size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+
+
+def parse_filter_datetime(date_str, time_str, default_time):
+    """Parse date (DD-Mon-YYYY) and time (HH:MM:SS) strings into a datetime."""
+    date = datetime.strptime(date_str.strip(), "%d-%b-%Y").date()
+    try:
+        t = datetime.strptime(time_str.strip(), "%H:%M:%S").time()
+    except ValueError:
+        t = datetime.strptime(default_time, "%H:%M:%S").time()
+    return datetime.combine(date, t)
+
+
+def parse_timestamps(timestamps):
+    """Vectorized parse of OPC server timestamps, keeping fractional seconds.
+
+    Input: "11/25/2025 2:02:03 PM.2390000" (MM/DD/YYYY H:MM:SS AM/PM.fraction)
+    Returns a datetime64[ns] Series; rows that fail to parse are NaT.
+    """
+    cleaned = timestamps.astype(str).str.strip().str.strip('"')
+    fraction = cleaned.str.extract(r' [AP]M\.(\d+)', expand=False)
+    cleaned = cleaned.str.replace(r' ([AP]M)\.\d+', r' \1', regex=True)
+    parsed = pd.to_datetime(cleaned, format=OPC_FORMAT, errors="coerce").astype("datetime64[ns]")
+    if fraction.notna().any():
+        # Fraction digits are decimal places: pad/truncate to nanoseconds
+        nanos = fraction.fillna("0").str.ljust(9, "0").str[:9].astype("int64")
+        parsed = parsed + pd.to_timedelta(nanos, unit="ns")
+    return parsed
+
+
+def read_csv(file_path, chunksize):
+    """Read a comma-delimited OPC export without headers, chunksize rows at a time.
+
+    Format: 12/3/2025 5:28:11 AM.7480000,651.261902,0x400c0
+    Columns get OPC_DTYPES instead of inferred object dtypes; the file is
+    memory-mapped and parsed by pandas. Returns an iterator of DataFrames.
+    load_files() reads with pyarrow instead when it is installed.
+    """
+    return _read_chunks(file_path, chunksize)
+
+
+def _arrow_options():
+    """Reader options giving pyarrow's CSV reader the OPC_DTYPES column types."""
+    # Explicit column types: pandas' pyarrow engine would infer hex quality codes as ints
+    return {
+        "read_options": pa_csv.ReadOptions(column_names=OPC_COLUMNS),
+        "convert_options": pa_csv.ConvertOptions(column_types={
+            "Timestamp": pa.string(),
+            "Value": pa.float64(),
+            "Quality": pa.dictionary(pa.int32(), pa.string()),
+        }),
+    }
+
+
+def _read_batches(file_path, chunksize, position=None):
+    """Yield typed chunks from pyarrow's streaming CSV reader.
+
+    Like _read_chunks(), but batches come from pyarrow, so a large file can
+    still be cancelled and report progress. If a Value turns out not to be
+    numeric, reading continues from that batch with _read_chunks().
+    """
+    rows = 0
+    with open(file_path, "rb") as handle:
+        try:
+            for batch in pa_csv.open_csv(handle, **_arrow_options()):
+                rows += batch.num_rows
+                if position is not None:
+                    position[0] = handle.tell()
+                yield batch.to_pandas()
+            return
+        except pa.ArrowInvalid:
+            pass  # A non-numeric Value, or an empty file
+    yield from _read_chunks(file_path, chunksize, position, skip_rows=rows)
+
+
+def _read_chunks(file_path, chunksize, position=None, skip_rows=0):
+    """Yield typed chunks from a memory-mapped file.
+
+    position, if given, is a one-item list updated with the byte offset read
+    so far. skip_rows data rows are skipped first, and Value is read as text
+    from there on. If a Value turns out not to be numeric, reading continues
+    from the end of the last chunk with the Value column left as text.
+    """
+    if os.path.getsize(file_path) == 0:
+        yield pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in OPC_DTYPES.items()})
+        return
+
+    with open(file_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        offset = 0
+        rows = skip_rows
+        dtypes = OPC_DTYPES if not skip_rows else dict(OPC_DTYPES, Value=object)
+        while True:
+            # Resume by byte offset: skiprows would count the blank lines the parser skips
+            offset = _row_offset(mapped, rows, offset)
+            rows = 0
+            mapped.seek(offset)
+            reader = pd.read_csv(mapped, header=None, names=OPC_COLUMNS, dtype=dtypes, chunksize=chunksize)
+            try:
+                for chunk in reader:
+                    rows += len(chunk)
+                    if position is not None:
+                        position[0] = mapped.tell()
+                    yield chunk
+                return
+            except ValueError:
+                if dtypes is not OPC_DTYPES:
+                    raise
+                dtypes = dict(OPC_DTYPES, Value=object)
+
+
+def _row_offset(mapped, rows, offset=0, block_size=1 << 24):
+    """Byte offset just past the next rows non-blank lines of mapped from offset."""
+    while rows and offset < len(mapped):
+        block = np.frombuffer(mapped[offset:offset + block_size], dtype=np.uint8)
+        ends = np.flatnonzero(block == ord("\n"))
+        if not len(ends):
+            return len(mapped)  # Only a final line without a newline is left
+        starts = np.concatenate([[0], ends[:-1] + 1])
+        # Empty lines and bare "\r" lines are skipped by both parsers
+        blank = (ends == starts) | ((ends == starts + 1) & (block[starts] == ord("\r")))
+        counted = np.cumsum(~blank)
+        if counted[-1] >= rows:
+            return offset + int(ends[np.searchsorted(counted, rows)]) + 1
+        rows -= int(counted[-1])
+        offset += int(ends[-1]) + 1
+    return offset
+
+
+def concat_frames(frames):
+    """pd.concat that keeps columns categorical when chunks saw different categories."""
+    if len(frames) > 1:
+        for col in frames[0].columns:
+            columns = [frame[col] for frame in frames if col in frame.columns]
+            if len(columns) < len(frames) or not all(
+                    isinstance(column.dtype, pd.CategoricalDtype) for column in columns):
+                continue
+            # Categories may come from different parsers (C or pyarrow), so unify as plain strings
+            categories = pd.unique(np.concatenate(
+                [column.cat.categories.astype(str).to_numpy(dtype=object) for column in columns]
+            ))
+            dtype = pd.CategoricalDtype(pd.Index(categories, dtype=object))
+            frames = [frame.assign(**{col: frame[col].astype(dtype)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def quality_codes(quality):
+    """Convert hex quality strings ("0x400c0") to uint32 codes.
+
+    Only the distinct values are parsed. Returns quality unchanged if any
+    value is missing or not hexadecimal.
+    """
+    if not isinstance(quality.dtype, pd.CategoricalDtype):
+        quality = quality.astype("category")
+    codes = quality.cat.codes.to_numpy()
+    if (codes < 0).any():
+        return quality
+    try:
+        table = np.array([int(str(c).strip(), 16) for c in quality.cat.categories], dtype=np.uint32)
+    except (ValueError, OverflowError):
+        return quality
+    return pd.Series(table[codes] if len(table) else np.zeros(0, np.uint32), index=quality.index)
+
+
+def compact_frame(df):
+    """Store a parsed chunk in compact columnar form.
+
+    PARSED holds the time as datetime64[ns] (int64 epoch nanoseconds), Value
+    is float64 and Quality a uint32 code. Timestamp keeps the original text
+    only for rows that failed to parse, as a mostly-empty categorical; every
+    other timestamp string is rebuilt on demand for previews and output.
+    """
+    parsed = df[PARSED]
+    return pd.DataFrame({
+        "Timestamp": pd.Categorical(df["Timestamp"].where(parsed.isna())),
+        "Value": df["Value"],
+        "Quality": quality_codes(df["Quality"]),
+        PARSED: parsed,
+    }, index=df.index)
+
+
+class ParseCache:
+    """On-disk cache of compact parsed frames, one .npz file per input file.
+
+    Entries are keyed by absolute path, size, mtime and PARSER_VERSION, so an
+    edited or replaced export is simply parsed again; the older entry for the
+    same path is removed then. Columns are stored as plain arrays
+    (categoricals as codes plus categories), so a hit costs a few array reads
+    instead of CSV parsing. Once the directory holds more than max_bytes the
+    least recently used entries are deleted.
+    """
+
+    def __init__(self, directory=DEFAULT_PARSE_CACHE_DIR, max_bytes=DEFAULT_PARSE_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path_prefix(self, file_path):
+        """Start of the cache filenames used for file_path, whatever its version."""
+        return hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+
+    def entry_path(self, file_path):
+        """Cache file for file_path as it currently is on disk."""
+        info = os.stat(file_path)
+        version = hashlib.sha1(f"{info.st_size}|{info.st_mtime_ns}|{PARSER_VERSION}".encode("utf-8"))
+        return os.path.join(self.directory, f"{self._path_prefix(file_path)}-{version.hexdigest()}.npz")
+
+    def get(self, file_path):
+        """Return the cached compact frame for file_path, or None on a miss."""
+        try:
+            path = self.entry_path(file_path)
+            with np.load(path, allow_pickle=False) as data:
+                frame = pd.DataFrame({
+                    "Timestamp": _load_column(data, "Timestamp"),
+                    "Value": data["Value"],
+                    "Quality": _load_column(data, "Quality"),
+                    PARSED: data[PARSED].view("datetime64[ns]"),
+                })
+            os.utime(path)  # Mark as recently used for pruning
+            return frame
+        except (OSError, KeyError, ValueError):
+            return None  # missing, unreadable or written by another layout
+
+    def put(self, file_path, df):
+        """Store a compact frame for file_path, replacing any older entry atomically.
+
+        Frames whose Value column had to stay text (a non-numeric value in
+        the export) are not cached; they are rare and simply parsed again.
+        """
+        if df["Value"].dtype != np.float64:
+            return
+        arrays = {"Value": df["Value"].to_numpy(),
+                  PARSED: df[PARSED].to_numpy(dtype="datetime64[ns]").view("int64")}
+        for col in ("Timestamp", "Quality"):
+            _store_column(arrays, col, df[col])
+        path = self.entry_path(file_path)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(temp_path, path)
+            self.prune(keep=path)
+        except OSError:
+            # A cache that can't be written just means parsing again next time
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def prune(self, keep=None):
+        """Drop entries superseded by keep, then the least recently used beyond max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".npz") or path == keep:
+                continue
+            if keep is not None and name.split("-")[0] == os.path.basename(keep).split("-")[0]:
+                os.remove(path)  # An older version of the same input file
+                continue
+            info = os.stat(path)
+            entries.append((info.st_mtime, info.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        if keep is not None:
+            total += os.path.getsize(keep)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+def _store_column(arrays, col, series):
+    """Add a compact_frame() column to arrays as numpy-native data."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        arrays[col + ".codes"] = series.cat.codes.to_numpy()
+        arrays[col + ".categories"] = np.array(series.cat.categories.astype(str), dtype=str)
+    else:
+        arrays[col] = series.to_numpy()
+
+
+def _load_column(data, col):
+    """Inverse of _store_column()."""
+    if col in data:
+        return data[col]
+    categories = data[col + ".categories"]
+    return pd.Categorical.from_codes(data[col + ".codes"], pd.Index(categories.tolist(), dtype=object))
+
+
+def load_files(file_paths, progress=None, cancel=None, chunksize=DEFAULT_CHUNKSIZE, cache=None):
+    """Read and combine OPC exports into one compact frame sorted by timestamp.
+
+    Timestamps are parsed once here and kept in the PARSED column, which the
+    pipeline reuses instead of parsing the strings again; see compact_frame()
+    for the column layout. Rows that failed to parse stay after the row
+    before them in their file, as in iter_merged_chunks(). Files already in
+    time order (the usual case) are k-way merged; only unsorted files are
+    sorted first. progress receives (bytes read, total bytes).
+    With a ParseCache, files parsed before are read from it instead.
+    """
+    total = sum(os.path.getsize(path) for path in file_paths)
+    done = 0
+    sources = []
+    for path in file_paths:
+        df = cache.get(path) if cache is not None else None
+        if df is not None:
+            _report(progress, cancel, done, total)
+        else:
+            dataframes = []
+            position = [0]
+            reader = _read_batches if HAVE_PYARROW else _read_chunks
+            for chunk in reader(path, chunksize, position):
+                chunk[PARSED] = parse_timestamps(chunk["Timestamp"])
+                dataframes.append(compact_frame(chunk))
+                _report(progress, cancel, done + position[0], total)
+            df = concat_frames(dataframes)
+            if cache is not None:
+                cache.put(path, df)
+        done += os.path.getsize(path)
+
+        keys = _merge_keys(df[PARSED].to_numpy().view("int64"))
+        if not is_time_sorted(keys):
+            df = df.iloc[np.argsort(keys, kind="stable")].reset_index(drop=True)
+        sources.append(_keyed_source([df], path))
+
+    merged = list(merge_sorted(sources))
+    return concat_frames(merged) if merged else df.iloc[:0]
+
+
+def is_time_sorted(nanos):
+    """True if an int64 nanosecond array is in non-decreasing order."""
+    return len(nanos) < 2 or bool((nanos[1:] >= nanos[:-1]).all())
+
+
+def _keyed_source(chunks, source):
+    """Pair parsed chunks with int64 merge keys, checking they stay in order.
+
+    Rows that failed to parse take the key of the row before them, so they
+    stay next to their neighbours. Raises UnsortedInput(source) on the first
+    chunk that goes back in time.
+    """
+    last = NAT_NANOS
+    for chunk in chunks:
+        keys = _merge_keys(chunk[PARSED].to_numpy().view("int64"), last)
+        if not is_time_sorted(np.concatenate([[last], keys])):
+            raise UnsortedInput(source)
+        if len(keys):
+            last = keys[-1]
+        yield chunk, keys
+
+
+def _merge_keys(nanos, last=NAT_NANOS):
+    """Merge keys for int64 nanos: failed rows (NaT) take the key before them, or last."""
+    nanos = np.concatenate([[last], nanos])
+    positions = np.where(nanos != NAT_NANOS, np.arange(len(nanos)), 0)
+    return nanos[np.maximum.accumulate(positions)][1:]
+
+
+def merge_sorted(sources):
+    """Streaming k-way merge of time-ordered (chunk, keys) sources.
+
+    Each round emits every buffered row older than the smallest "last key"
+    among sources that still have data, then reads ahead only from the
+    sources that set that bound. Rows with equal keys keep source order, so
+    the result matches a stable sort of the concatenated sources while
+    holding roughly one chunk per source in memory.
+    """
+    sources = [iter(source) for source in sources]
+    buffers = [[] for _ in sources]
+    exhausted = [False] * len(sources)
+
+    def refill(index):
+        for chunk, keys in sources[index]:
+            if len(keys):
+                buffers[index].append((chunk, keys))
+                return
+        exhausted[index] = True
+
+    for index in range(len(sources)):
+        refill(index)
+
+    while True:
+        active = [index for index in range(len(sources)) if not exhausted[index]]
+        watermark = min(buffers[index][-1][1][-1] for index in active) if active else None
+
+        pieces, piece_keys = [], []
+        for buffer in buffers:
+            while buffer:
+                chunk, keys = buffer[0]
+                cut = len(keys) if watermark is None else int(keys.searchsorted(watermark, side="left"))
+                if cut == 0:
+                    break
+                pieces.append(chunk.iloc[:cut])
+                piece_keys.append(keys[:cut])
+                if cut < len(keys):
+                    buffer[0] = (chunk.iloc[cut:], keys[cut:])
+                    break
+                buffer.pop(0)
+
+        if pieces:
+            # Pieces are sorted runs, so the stable (tim)sort merges them in ~linear time
+            order = np.argsort(np.concatenate(piece_keys), kind="stable")
+            yield concat_frames(pieces).iloc[order].reset_index(drop=True)
+
+        if watermark is None:
+            return
+        for index in active:
+            if buffers[index][-1][1][-1] == watermark:
+                refill(index)
+
+
+def iter_merged_chunks(file_paths, chunksize=DEFAULT_CHUNKSIZE, presorted=()):
+    """Stream several exports as one time-ordered sequence of parsed chunks.
+
+    Files are assumed to be in time order and merged as they are read; a
+    file that is not raises UnsortedInput unless it is listed in presorted,
+    in which case it is loaded and sorted in memory up front.
+    """
+    sources = []
+    for path in file_paths:
+        if path in presorted:
+            chunks = [load_files([path], chunksize=chunksize)]
+        else:
+            chunks = attach_parsed(read_csv(path, chunksize=chunksize))
+        sources.append(_keyed_source(chunks, path))
+    return merge_sorted(sources)
+
+
+def iter_chunks(file_paths, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield fixed-size chunks from each file in turn (file order, unsorted)."""
+    for path in file_paths:
+        yield from read_csv(path, chunksize=chunksize)
+
+
+def iter_frame_chunks(df, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield row slices of an in-memory frame (always at least one)."""
+    for start in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def filter_bad_quality(chunks, stats):
+    """Drop rows flagged with the OPC bad quality code."""
+    for chunk in chunks:
+        quality = chunk["Quality"]
+        if quality.dtype == np.uint32:
+            keep = quality != BAD_QUALITY_CODE
+        elif isinstance(quality.dtype, pd.CategoricalDtype):
+            # Compare the few distinct codes, then look rows up by category code
+            bad = np.asarray(quality.cat.categories.astype(str).str.strip() == BAD_QUALITY)
+            codes = quality.cat.codes.to_numpy()
+            keep = np.ones(len(codes), dtype=bool)
+            coded = codes >= 0
+            keep[coded] = ~bad[codes[coded]]
+            keep = pd.Series(keep, index=chunk.index)
+        else:
+            keep = quality.astype(str).str.strip() != BAD_QUALITY
+        stats.bad_quality_removed += int((~keep).sum())
+        yield chunk[keep]
+
+
+def attach_parsed(chunks):
+    """Parse and compact chunks that were not parsed at load time."""
+    for chunk in chunks:
+        if PARSED not in chunk.columns:
+            chunk = compact_frame(chunk.assign(**{PARSED: parse_timestamps(chunk["Timestamp"])}))
+        yield chunk
+
+
+def apply_offset(chunks, options):
+    """Truncate parsed times to whole seconds and apply the hour offset."""
+    for chunk in chunks:
+        parsed = chunk[PARSED].dt.floor("s")
+        if options.hour_offset != 0:
+            parsed = parsed + pd.Timedelta(hours=options.hour_offset)
+        yield pd.DataFrame({
+            "Timestamp": chunk["Timestamp"],
+            "Value": chunk["Value"],
+            PARSED: parsed
+        })
+
+
+def filter_range(chunks, options, stats, ordered=False):
+    """Keep rows between options.start and options.end (inclusive).
+
+    Rows whose timestamp could not be parsed are dropped. With ordered=True
+    the caller guarantees the stream is in time order apart from those rows
+    (load_files() and merged input are), so each chunk is cut with a binary
+    search and a slice instead of a full mask.
+    """
+    start = pd.Timestamp(options.start).value if options.start is not None else None
+    end = pd.Timestamp(options.end).value if options.end is not None else None
+    for chunk in chunks:
+        nanos = chunk[PARSED].to_numpy().view("int64")
+        if ordered:
+            lo = _search_ordered(nanos, start, right=False) if start is not None else 0
+            hi = _search_ordered(nanos, end, right=True) if end is not None else len(nanos)
+            kept = chunk.iloc[lo:max(lo, hi)]
+            failed = nanos[lo:max(lo, hi)] == NAT_NANOS
+            if failed.any():
+                kept = kept[~failed]
+        else:
+            mask = nanos != NAT_NANOS
+            if start is not None:
+                mask &= nanos >= start
+            if end is not None:
+                mask &= nanos <= end
+            kept = chunk[mask]
+        stats.rows_filtered += len(chunk) - len(kept)
+        yield kept
+
+
+def _search_ordered(nanos, target, right):
+    """Binary search time-ordered int64 nanos for target, like searchsorted.
+
+    Rows that failed to parse (NaT) may sit anywhere; each probe that lands
+    on one uses the nearest parsed row before it, so they never need
+    skipping up front.
+    """
+    lo, hi = 0, len(nanos)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probe = mid
+        while probe >= 0 and nanos[probe] == NAT_NANOS:
+            probe -= 1
+        value = nanos[probe] if probe >= 0 else NAT_NANOS
+        if value < target or (right and value == target):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def remove_duplicates(chunks, stats, window=DEDUPE_WINDOW):
+    """Drop rows whose converted timestamp was already seen (keeps the first).
+
+    Parsed rows compare by whole second as int64 nanoseconds. While the
+    stream is time-ordered each row only needs comparing with the previous
+    one; once a chunk arrives out of order the most recent `window` distinct
+    timestamps move into a hash set, evicted oldest chunk first, so memory
+    stays bounded however many files stream through. Rows that failed to
+    parse compare by their original string, matching what is written out.
+    """
+    previous = None   # last parsed timestamp while the stream is ordered
+    recent = deque()  # kept timestamps per chunk, newest last
+    remembered = 0
+    seen = None       # hash set of the keys in recent, once out of order
+    seen_raw = set()
+    for chunk in chunks:
+        parsed = chunk[PARSED]
+        ok = parsed.notna().to_numpy()
+        mask = np.ones(len(chunk), dtype=bool)
+        if ok.any():
+            values = parsed.to_numpy(dtype="datetime64[ns]")[ok].view("int64")
+            if seen is None and (previous is None or values[0] >= previous) \
+                    and (values[1:] >= values[:-1]).all():
+                keep = np.empty(len(values), dtype=bool)
+                keep[0] = values[0] != previous
+                keep[1:] = values[1:] != values[:-1]
+                previous = values[-1]
+            else:
+                if seen is None:
+                    seen = set()
+                    for keys in recent:
+                        seen.update(keys.tolist())
+                keep = ~pd.Series(values).duplicated().to_numpy()
+                keep[keep] = [value not in seen for value in values[keep].tolist()]
+                seen.update(values[keep].tolist())
+            kept = values[keep]
+            recent.append(kept)
+            remembered += len(kept)
+            while remembered - len(recent[0]) >= window:
+                evicted = recent.popleft()
+                remembered -= len(evicted)
+                if seen is not None:
+                    seen.difference_update(evicted.tolist())
+            mask[ok] = keep
+        if not ok.all():
+            raw = chunk["Timestamp"][~ok]
+            keep = ~raw.duplicated() & ~raw.isin(seen_raw)
+            seen_raw.update(raw[keep])
+            mask[~ok] = keep.to_numpy()
+        stats.duplicates_removed += int((~mask).sum())
+        yield chunk[mask]
+
+
+def check_downsample(method, seconds, deviation):
+    """Raise ValueError describing what is wrong with a downsampling setting.
+
+    Bucket methods need an interval in seconds; deadband and swinging-door
+    need a deviation, and take the interval as an optional longest gap
+    between kept points.
+    """
+    if method is None:
+        return
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}'. Use one of: {', '.join(DOWNSAMPLE_METHODS)}")
+    # Output times have whole-second resolution, so shorter or fractional intervals would repeat them
+    if seconds is not None and (seconds < 1 or seconds != int(seconds)):
+        raise ValueError("Downsampling interval must be a whole number of seconds, 1 or more")
+    if method in BUCKET_METHODS and seconds is None:
+        raise ValueError(f"Downsampling by {method} needs an interval in seconds")
+    if method in COMPRESSION_METHODS and (deviation is None or deviation < 0):
+        raise ValueError(f"Downsampling by {method} needs a deviation of 0 or more")
+
+
+def _bucket_rows(nanos, values, starts, method):
+    """Positions of the rows each bucket keeps (min/max/first/last), in time order.
+
+    starts holds the first position of each bucket. Ties keep the earliest
+    row; NaN values only win a bucket that has nothing else.
+    """
+    ends = np.append(starts[1:], len(nanos))
+    if method == "first":
+        return starts
+    if method == "last":
+        return ends - 1
+    bucket = np.repeat(np.arange(len(starts)), ends - starts)
+    picked = []
+    if method in ("min", "minmax"):
+        picked.append(np.lexsort((values, bucket))[starts])
+    if method in ("max", "minmax"):
+        picked.append(np.lexsort((-values, bucket))[starts])
+    return np.unique(np.concatenate(picked))
+
+
+def _numeric_values(frame):
+    """Value as float64; text that isn't a number (e.g. "I/O Timeout") gives NaN."""
+    if frame["Value"].dtype == np.float64:
+        return frame["Value"].to_numpy()
+    return pd.to_numeric(frame["Value"], errors="coerce").to_numpy(dtype="float64")
+
+
+def _bucket_frame(frame, nanos, interval, method):
+    """Aggregate a time-ordered frame into one row per interval (two for minmax)."""
+    if len(frame) == 0:
+        return frame
+    keys = nanos // interval
+    starts = np.flatnonzero(np.append(True, keys[1:] != keys[:-1]))
+    # first/last only pick positions, so the values are never converted for them
+    values = _numeric_values(frame) if method not in ("first", "last") else None
+    if method != "mean":
+        return frame.iloc[_bucket_rows(nanos, values, starts, method)]
+    # Mean of the non-NaN values, stamped with the start of the interval
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    counts = np.add.reduceat(valid.astype("int64"), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    out = frame.iloc[starts].copy()
+    out["Value"] = means
+    out[PARSED] = (keys[starts] * interval).view("datetime64[ns]")
+    return out
+
+
+class _Compressor:
+    """Sequential deadband / swinging-door state carried across chunks.
+
+    feed() takes time-ordered (seconds, value) lists and returns the
+    positions to keep; the last point seen is held back (it may still be
+    replaced) and is only kept by a later point or by finish().
+    """
+
+    def __init__(self, method, deviation, max_gap):
+        self.swinging = method == "swinging-door"
+        self.deviation = deviation
+        self.max_gap = max_gap
+        self.archived = None  # (time, value) of the last kept point
+        self.upper = self.lower = None
+        self.held = None  # position of the held-back point after feed()
+
+    def _restart(self, time_s, value):
+        """Make (time_s, value) the last kept point; after a NaN, start over."""
+        self.archived = None if value != value else (time_s, value)
+        self.upper, self.lower = float("inf"), float("-inf")
+
+    def feed(self, times, values, held=False):
+        """Return kept positions; held=True means position 0 is the point held from the last chunk."""
+        keep = []
+        previous = 0 if held else None
+        for position in range(1 if held else 0, len(times)):
+            time_s, value = times[position], values[position]
+            if (self.archived is None or value != value
+                    or (self.max_gap is not None and time_s - self.archived[0] >= self.max_gap)):
+                # First point, NaN or too long since the last kept point
+                if self.swinging and previous is not None:
+                    keep.append(previous)
+                keep.append(position)
+                self._restart(time_s, value)
+                previous = None
+                continue
+            archived_time, archived_value = self.archived
+            if not self.swinging:
+                if abs(value - archived_value) > self.deviation:
+                    keep.append(position)
+                    self._restart(time_s, value)
+                    previous = None
+                else:
+                    previous = position
+                continue
+            gap = time_s - archived_time
+            if gap > 0:
+                self.upper = min(self.upper, (value + self.deviation - archived_value) / gap)
+                self.lower = max(self.lower, (value - self.deviation - archived_value) / gap)
+                if self.lower > self.upper and previous is not None:
+                    # Door closed: keep the held point and swing new doors from it
+                    keep.append(previous)
+                    self._restart(times[previous], values[previous])
+                    gap = time_s - times[previous]
+                    if gap > 0:
+                        self.upper = (value + self.deviation - values[previous]) / gap
+                        self.lower = (value - self.deviation - values[previous]) / gap
+            previous = position
+        self.held = previous
+        return keep
+
+
+def downsample(chunks, options, stats):
+    """Reduce time-ordered chunks with one of DOWNSAMPLE_METHODS.
+
+    Bucket methods group rows into options.downsample_seconds intervals
+    (aligned to the epoch) and keep the first, last, minimum and/or maximum
+    row of each, or the mean stamped with the interval start; rows of the
+    last interval of a chunk are carried into the next one. "deadband" keeps
+    a row once its value moves more than options.deviation from the last
+    kept row; "swinging-door" is PI-style compression with options.deviation
+    as the compression deviation, keeping the points between which the
+    series can be redrawn as straight lines. Both also keep a
+    row once options.downsample_seconds have passed, if set. Rows whose
+    timestamp failed to parse pass through unchanged, as do rows with a
+    text Value for every method but first and last. Input that goes back
+    in time across chunks starts new intervals rather than reopening old
+    ones.
+    """
+    method = options.downsample
+    interval = int(options.downsample_seconds * NANOS_PER_SECOND) if options.downsample_seconds else None
+    compressor = None
+    if method in COMPRESSION_METHODS:
+        compressor = _Compressor(method, options.deviation, options.downsample_seconds)
+    carry = None  # rows not yet decided: the open interval, or the held point
+    last = NAT_NANOS  # merge key of the last row seen
+    through = []  # (rows, merge keys) passed through but not yet placed
+    for chunk in chunks:
+        keys = _merge_keys(chunk[PARSED].to_numpy().view("int64"), last)
+        if len(keys):
+            last = keys[-1]
+        failed = chunk[PARSED].isna().to_numpy()
+        if method not in ("first", "last") and chunk["Value"].dtype != np.float64:
+            failed = failed | (np.isnan(_numeric_values(chunk)) & chunk["Value"].notna().to_numpy())
+        rows = chunk[~failed]
+        nanos = rows[PARSED].to_numpy().view("int64")
+        if not is_time_sorted(nanos):
+            rows = rows.iloc[np.argsort(nanos, kind="stable")]
+        if carry is not None:
+            rows = concat_frames([carry, rows])
+        nanos = rows[PARSED].to_numpy().view("int64")
+        carried = 0 if carry is None else len(carry)
+
+        if compressor is None:
+            # Hold back the last interval; it may continue in the next chunk
+            cut = int(nanos.searchsorted(nanos[-1] // interval * interval)) if len(nanos) else 0
+            kept = _bucket_frame(rows.iloc[:cut], nanos[:cut], interval, method)
+            carry = rows.iloc[cut:]
+        else:
+            positions = compressor.feed((nanos / NANOS_PER_SECOND).tolist(),
+                                        _numeric_values(rows).tolist(), held=carried > 0)
+            kept = rows.iloc[positions]
+            carry = rows.iloc[[compressor.held]] if compressor.held is not None else None
+        consumed = len(rows) - (0 if carry is None else len(carry))
+        stats.rows_downsampled += consumed - len(kept)
+        if failed.any():
+            through.append((chunk[failed], keys[failed]))
+        # Rows still undecided (and what they become) are no older than bound
+        bound = None
+        if carry is not None and len(carry):
+            bound = int(carry[PARSED].to_numpy().view("int64")[0])
+            if compressor is None:
+                bound = bound // interval * interval
+        kept, through = _place_through(kept, through, bound)
+        yield kept
+
+    kept = carry.iloc[:0] if carry is not None else None
+    if carry is not None and len(carry):
+        if compressor is None:
+            nanos = carry[PARSED].to_numpy().view("int64")
+            kept = _bucket_frame(carry, nanos, interval, method)
+        else:
+            kept = carry  # the final point always ends the compressed series
+        stats.rows_downsampled += len(carry) - len(kept)
+    if kept is not None:
+        kept, _ = _place_through(kept, through, None)
+        yield kept
+    elif through:
+        yield concat_frames([rows for rows, _ in through])
+
+
+def _place_through(kept, through, bound):
+    """Merge passed-through rows into kept rows after the row before them.
+
+    through holds (rows, merge keys) pairs; a row goes after every kept row
+    no newer than its key. Rows whose key is not below bound wait, since
+    rows they follow may still be kept later. Returns (frame, still waiting).
+    """
+    if not through:
+        return kept, through
+    rows = concat_frames([rows for rows, _ in through])
+    keys = np.concatenate([keys for _, keys in through])
+    ready = keys < bound if bound is not None else np.ones(len(keys), dtype=bool)
+    waiting = [(rows[~ready], keys[~ready])] if not ready.all() else []
+    if not ready.any():
+        return kept, waiting
+    order = np.argsort(np.concatenate([kept[PARSED].to_numpy().view("int64"), keys[ready]]), kind="stable")
+    return concat_frames([kept, rows[ready]]).iloc[order].reset_index(drop=True), waiting
+
+
+def _ascii_digits(values, width):
+    """Zero-padded decimal digits of non-negative ints as an (n, width) uint8 array."""
+    values = np.asarray(values, dtype="int64")
+    out = np.empty((len(values), width), dtype=np.uint8)
+    for column in range(width - 1, -1, -1):
+        out[:, column] = ord("0") + values % 10
+        values = values // 10
+    return out
+
+
+def _time_table():
+    """Return the (86400, 8) uint8 table of "HH:MM:SS" strings."""
+    global _time_of_day_table
+    if _time_of_day_table is None:
+        seconds = np.arange(SECONDS_PER_DAY)
+        table = np.full((SECONDS_PER_DAY, 8), ord(":"), dtype=np.uint8)
+        table[:, 0:2] = _ascii_digits(seconds // 3600, 2)
+        table[:, 3:5] = _ascii_digits(seconds // 60 % 60, 2)
+        table[:, 6:8] = _ascii_digits(seconds % 60, 2)
+        _time_of_day_table = table
+    return _time_of_day_table
+
+
+def format_pi_bytes(nanos):
+    """Format int64 epoch nanoseconds (no NaT) as DD-Mon-YYYY HH:MM:SS bytes.
+
+    Samples fall on few distinct days, so a "DD-Mon-YYYY " prefix is built
+    once per day and joined with a precomputed time-of-day table; no per-row
+    Python formatting is involved. Returns an S20 array, or None for years
+    outside 1000-9999.
+    """
+    seconds = np.asarray(nanos, dtype="int64") // NANOS_PER_SECOND
+    days = seconds // SECONDS_PER_DAY
+    out = np.empty((len(seconds), 20), dtype=np.uint8)
+    if len(seconds) == 0:
+        return out.view("S20").ravel()
+
+    # Index into the contiguous day range, or the distinct days if that is sparse
+    first_day, last_day = int(days.min()), int(days.max())
+    if last_day - first_day < len(days):
+        day_values, day_index = np.arange(first_day, last_day + 1), days - first_day
+    else:
+        day_values, day_index = np.unique(days, return_inverse=True)
+    covered = pd.DatetimeIndex((day_values * SECONDS_PER_DAY).astype("datetime64[s]"))
+    years = covered.year.to_numpy()
+    if years.min() < 1000 or years.max() > 9999:
+        return None
+
+    prefixes = np.full((len(covered), 12), ord("-"), dtype=np.uint8)
+    prefixes[:, 0:2] = _ascii_digits(covered.day.to_numpy(), 2)
+    prefixes[:, 3:6] = MONTH_ABBRS[covered.month.to_numpy() - 1].view(np.uint8).reshape(-1, 3)
+    prefixes[:, 7:11] = _ascii_digits(years, 4)
+    prefixes[:, 11] = ord(" ")
+
+    out[:, :12] = prefixes[day_index]
+    out[:, 12:] = _time_table()[seconds - days * SECONDS_PER_DAY]
+    return out.view("S20").ravel()
+
+
+def format_pi_timestamps(parsed):
+    """Vectorized equivalent of parsed.dt.strftime(PI_FORMAT); NaT gives None."""
+    nanos = parsed.to_numpy(dtype="datetime64[ns]").view("int64")
+    valid = nanos != NAT_NANOS
+    formatted = format_pi_bytes(nanos[valid]) if valid.any() else None
+    if formatted is None:
+        formatted = parsed.dt.strftime(PI_FORMAT).to_numpy(dtype=object)[valid]
+    values = np.full(len(nanos), None, dtype=object)
+    values[valid] = formatted.astype("U20") if formatted.dtype != object else formatted
+    return pd.Series(values, index=parsed.index, dtype=object)
+
+
+def format_opc_timestamps(parsed):
+    """Format parsed times back to OPC style, e.g. "12/3/2025 5:28:11 AM.7480000".
+
+    Meant for preview-sized slices; NaT gives None.
+    """
+    formatted = []
+    for ts in parsed:
+        if pd.isna(ts):
+            formatted.append(None)
+            continue
+        hour = ts.hour % 12 or 12
+        fraction = (ts.microsecond * 1000 + ts.nanosecond) // 100
+        formatted.append(
+            f"{ts.month}/{ts.day}/{ts.year} {hour}:{ts.minute:02d}:{ts.second:02d} "
+            f"{'AM' if ts.hour < 12 else 'PM'}.{fraction:07d}"
+        )
+    return pd.Series(formatted, index=parsed.index, dtype=object)
+
+
+def display_frame(df):
+    """Rebuild the original Timestamp/Value/Quality text for a slice of loaded data."""
+    if PARSED not in df.columns:
+        return df[OPC_COLUMNS]
+    timestamps = format_opc_timestamps(df[PARSED])
+    failed = timestamps.isna()
+    if failed.any():
+        timestamps[failed] = df["Timestamp"][failed].astype(object)
+    quality = df["Quality"]
+    if quality.dtype == np.uint32:
+        quality = pd.Series([f"{code:#x}" for code in quality], index=df.index, dtype=object)
+    return pd.DataFrame({"Timestamp": timestamps, "Value": df["Value"], "Quality": quality})
+
+
+def output_frame(df):
+    """Written form of converted rows: times formatted as DD-Mon-YYYY HH:MM:SS.
+
+    Converted frames keep parsed times, so this runs only on what is
+    written or shown. Rows that failed to parse keep their original
+    timestamp string.
+    """
+    parsed = df[PARSED]
+    converted_timestamps = format_pi_timestamps(parsed)
+    failed = parsed.isna()
+    if failed.any():
+        converted_timestamps[failed] = df["Timestamp"][failed]
+    return df.assign(Timestamp=converted_timestamps).drop(columns=PARSED)
+
+
+def finalize(chunks, options):
+    """Prepend the Tagname column when one is set.
+
+    The tagname is a one-category categorical, so it costs a byte per row.
+    """
+    for chunk in chunks:
+        if options.tagname:
+            chunk = chunk.copy()
+            codes = np.zeros(len(chunk), dtype=np.int8)
+            chunk.insert(0, "Tagname", pd.Categorical.from_codes(codes, [options.tagname]))
+        yield chunk
+
+
+def pipeline_stages(options, ordered=False):
+    """List the conversion stages as (key, stage) pairs.
+
+    key holds the options the stage's output depends on; stage is None when
+    the stage is disabled and passes chunks through unchanged. ordered=True
+    promises the input is in time order (see filter_range()).
+    """
+    ranged = options.start is not None or options.end is not None
+    return [
+        (("quality", options.remove_bad_quality),
+         (lambda chunks, stats: filter_bad_quality(chunks, stats)) if options.remove_bad_quality else None),
+        (("offset", options.hour_offset),
+         lambda chunks, stats: apply_offset(chunks, options)),
+        (("range", options.start, options.end),
+         (lambda chunks, stats: filter_range(chunks, options, stats, ordered)) if ranged else None),
+        (("dedupe", options.remove_duplicates),
+         (lambda chunks, stats: remove_duplicates(chunks, stats)) if options.remove_duplicates else None),
+        (("downsample", options.downsample, options.downsample_seconds, options.deviation),
+         (lambda chunks, stats: downsample(chunks, options, stats)) if options.downsample else None),
+    ]
+
+
+def run_pipeline(chunks, options, stats, progress=None, cancel=None, total_rows=None, ordered=False):
+    """Chain the enabled conversion stages over an iterable of raw chunks.
+
+    ordered=True promises the chunks are in time order, as merged input is.
+
+    progress receives (rows read, total_rows) before each chunk is processed.
+    Each stage is timed; the timings land in stats.stages once the output
+    has been consumed.
+    """
+    def counted(source):
+        for chunk in source:
+            _report(progress, cancel, stats.rows_in, total_rows)
+            stats.rows_in += len(chunk)
+            yield chunk
+
+    timings = []
+
+    def timed(stream, name):
+        timings.append(StageTiming(name))
+        return timed_stage(stream, timings[-1])
+
+    stream = timed(counted(chunks), "read")
+    stream = timed(attach_parsed(stream), "parse")
+    for key, stage in pipeline_stages(options, ordered):
+        if stage is not None:
+            stream = timed(stage(stream, stats), key[0])
+    for chunk in timed(finalize(stream, options), "finalize"):
+        stats.rows_out += len(chunk)
+        yield chunk
+    exclusive_times(timings)
+    timings[0].rows_in = timings[0].rows_out
+    stats.stages.extend(timings)
+
+
+def convert_frame(df, options, progress=None, cancel=None, cache=None, ordered=False):
+    """Convert an in-memory frame. Returns (converted_df, stats).
+
+    converted_df keeps parsed times in the PARSED column rather than
+    formatted strings; output_frame() gives the written form of any slice.
+
+    With a StageCache, each stage's output is stored under a key of the
+    options it depends on, and the run resumes from the deepest stage whose
+    key is already cached, so changing only a late-stage option (range,
+    dedupe, tagname) skips the parse/offset work. Pass ordered=True for a
+    frame from load_files(), which is in time order.
+    """
+    stages = pipeline_stages(options, ordered and PARSED in df.columns)
+    keys = []
+    key = (id(df), len(df))
+    for stage_key, _ in stages:
+        key = key + (stage_key,)
+        keys.append(key)
+
+    timings = []
+    if PARSED not in df.columns:
+        timing = StageTiming("parse", rows_in=len(df))
+        start = time.perf_counter()
+        df = next(attach_parsed([df]))
+        timing.stop(start, len(df))
+        timings.append(timing)
+
+    # Resume after the deepest cached stage
+    frame, stats, first = df, ConversionStats(), 0
+    stats.rows_in = len(df)
+    if cache is not None:
+        for index in range(len(stages) - 1, -1, -1):
+            if keys[index] in cache:
+                frame, stats = cache.get(keys[index])
+                stats = stats.copy()
+                first = index + 1
+                break
+    # Only the stages run this time are timed
+    stats.stages = timings
+
+    pending = [index for index in range(first, len(stages)) if stages[index][1] is not None]
+    total = len(df) * len(pending)
+    for step, index in enumerate(pending):
+        def counted(source, done=step * len(df)):
+            for chunk in source:
+                _report(progress, cancel, done, total)
+                done += len(chunk)
+                yield chunk
+
+        timing = StageTiming(stages[index][0][0], rows_in=len(frame))
+        start = time.perf_counter()
+        frame = concat_frames(list(stages[index][1](counted(iter_frame_chunks(frame)), stats)))
+        timing.stop(start, len(frame))
+        stats.stages.append(timing)
+        if cache is not None:
+            cache.put(keys[index], frame, stats)
+
+    timing = StageTiming("finalize", rows_in=len(frame))
+    start = time.perf_counter()
+    converted = pd.concat(list(finalize([frame], options)), ignore_index=True)
+    timing.stop(start, len(converted))
+    stats.stages.append(timing)
+    stats.rows_out = len(converted)
+    return converted, stats
+
+
+def write_chunks(chunks, file_path, encoding="cp1252", progress=None, cancel=None, total_rows=None):
+    """Stream converted chunks to a headerless CSV file. Returns rows written.
+
+    Timestamps are formatted chunk by chunk as they are written (see
+    output_frame()). Rows go to a temporary file next to file_path through a large write
+    buffer, and it is renamed over file_path only once everything has been
+    written, so a failed or cancelled save never leaves a partial file.
+    """
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    rows = 0
+    try:
+        with open(temp_path, "w", encoding=encoding, newline="", buffering=WRITE_BUFFER_BYTES) as handle:
+            for chunk in chunks:
+                _report(progress, cancel, rows, total_rows)
+                output_frame(chunk).to_csv(handle, index=False, header=False)
+                rows += len(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return rows
+
+
+def convert_files(file_paths, output_path, options, chunksize=DEFAULT_CHUNKSIZE, merge=True):
+    """Stream OPC exports through the pipeline into output_path. Returns stats.
+
+    The inputs are combined in time order (as the GUI does) by a streaming
+    k-way merge. An input found out of order mid-stream is sorted in memory
+    instead and the run restarts; the atomic writer discards the partial
+    output. merge=False streams the files as they are, in file order.
+    """
+    presorted = set()
+    while True:
+        stats = ConversionStats()
+        if merge:
+            source = iter_merged_chunks(file_paths, chunksize, presorted)
+        else:
+            source = iter_chunks(file_paths, chunksize)
+        try:
+            start = time.perf_counter()
+            write_chunks(run_pipeline(source, options, stats, ordered=merge), output_path, options.encoding)
+            # Whatever the pipeline stages didn't account for was spent writing
+            elapsed = time.perf_counter() - start
+            timing = StageTiming("write", max(0.0, elapsed - sum(t.seconds for t in stats.stages)),
+                                 stats.rows_out, stats.rows_out)
+            timing.note_memory()
+            stats.stages.append(timing)
+            return stats
+        except UnsortedInput as e:
+            presorted.add(e.source)
+
+
+def default_tagname(file_path):
+    """Derive a tagname from a file path (filename without extension)."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def group_by_tag(file_paths):
+    """Map each default_tagname() to its files, in tag order.
+
+    Exports of the same tag (e.g. one folder per day) share a group so they
+    can be merged in time order.
+    """
+    groups = {}
+    for path in file_paths:
+        groups.setdefault(default_tagname(path), []).append(path)
+    return dict(sorted(groups.items()))
+
+
+def concatenate_files(part_paths, output_path):
+    """Stream part files one after another into output_path, replacing it atomically.
+
+    Used to join per-tag outputs that are each in time order into one file
+    ordered by tag then time without loading any of them.
+    """
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as handle:
+            for part_path in part_paths:
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, handle, WRITE_BUFFER_BYTES)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
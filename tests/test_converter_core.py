@@ -0,0 +1,302 @@
+"""
+Engine checks against the original GUI conversion.
+
+baseline_convert() below is the original apply_conversion() logic with the
+Tk parts removed. Converted output from convert_frame() and convert_files()
+must match it byte for byte once written, for the bundled sample files and
+for synthetic exports with malformed, unsorted, duplicate and text-Value
+rows, at small chunk sizes too.
+
+Run with: python -m pytest tests
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+import converter_core as core
+import synthetic
+
+SAMPLE_FILES = [os.path.join(REPO_DIR, name) for name in
+                ["sample.csv", "sample1.csv", "sample2.csv", "sample3.csv", "sample4.csv", "sample5.csv"]]
+
+OPTION_SETS = [
+    {},
+    {"hour_offset": -5, "tagname": "TAG1"},
+    {"remove_bad_quality": True, "remove_duplicates": True},
+    {"hour_offset": 3, "remove_duplicates": True,
+     "start": datetime(2025, 12, 3, 9, 0, 0), "end": datetime(2025, 12, 3, 9, 45, 0)},
+    {"hour_offset": -5, "tagname": "T", "remove_bad_quality": True, "remove_duplicates": True,
+     "start": datetime(2025, 12, 3, 0, 40, 0), "end": datetime(2025, 12, 3, 23, 59, 59)},
+]
+
+
+def baseline_load(file_paths):
+    """Read and order files as the engine documents it, with pandas only.
+
+    The original sorted with an unstable sort and put unparseable rows
+    first; the engine sorts stably by full-precision time and keeps an
+    unparseable row after the row before it in its file, so the reference
+    does the same.
+    """
+    frames, keys = [], []
+    for path in file_paths:
+        df = pd.read_csv(path, header=None, names=["Timestamp", "Value", "Quality"])
+        cleaned = df["Timestamp"].astype(str).str.strip().str.strip('"')
+        fraction = cleaned.str.extract(r" [AP]M\.(\d+)", expand=False).fillna("0")
+        cleaned = cleaned.str.replace(r" ([AP]M)\.\d+", r" \1", regex=True)
+        parsed = pd.to_datetime(cleaned, format="%m/%d/%Y %I:%M:%S %p", errors="coerce")
+        parsed = parsed + pd.to_timedelta(fraction.str.ljust(9, "0").str[:9].astype("int64"), unit="ns")
+        nanos = parsed.astype("datetime64[ns]").ffill().fillna(pd.Timestamp.min)
+        frames.append(df)
+        keys.append(nanos.to_numpy(dtype="datetime64[ns]").view("int64"))
+    df = pd.concat(frames, ignore_index=True)
+    return df.iloc[np.argsort(np.concatenate(keys), kind="stable")].reset_index(drop=True)
+
+
+def baseline_convert(source_df, hour_offset=0, tagname=None, remove_bad_quality=False,
+                     remove_duplicates=False, start=None, end=None):
+    """The original apply_conversion(), returning the frame it showed and saved."""
+    if remove_bad_quality:
+        source_df = source_df[source_df["Quality"].astype(str).str.strip() != "0x100400c0"].reset_index(drop=True)
+
+    cleaned = source_df["Timestamp"].astype(str).str.strip().str.strip('"')
+    cleaned = cleaned.str.replace(r' ([AP]M)\.\d+', r' \1', regex=True)
+    parsed = pd.to_datetime(cleaned, format="%m/%d/%Y %I:%M:%S %p", errors="coerce")
+    if hour_offset != 0:
+        parsed = parsed + pd.Timedelta(hours=hour_offset)
+    converted_timestamps = parsed.dt.strftime("%d-%b-%Y %H:%M:%S")
+    failed = parsed.isna()
+    if failed.any():
+        converted_timestamps[failed] = source_df["Timestamp"][failed]
+
+    if tagname:
+        converted_df = pd.DataFrame({"Tagname": tagname, "Timestamp": converted_timestamps,
+                                     "Value": source_df["Value"]})
+    else:
+        converted_df = pd.DataFrame({"Timestamp": converted_timestamps, "Value": source_df["Value"]})
+
+    if start is not None or end is not None:
+        parsed_ts = pd.to_datetime(converted_df["Timestamp"], format="%d-%b-%Y %H:%M:%S", errors="coerce")
+        mask = parsed_ts.notna()
+        if start is not None:
+            mask = mask & (parsed_ts >= pd.Timestamp(start))
+        if end is not None:
+            mask = mask & (parsed_ts <= pd.Timestamp(end))
+        converted_df = converted_df[mask].reset_index(drop=True)
+
+    if remove_duplicates:
+        converted_df = converted_df.drop_duplicates(subset=["Timestamp"], keep="first").reset_index(drop=True)
+    return converted_df
+
+
+def write_text_value_export(path):
+    """A small export whose Value turns to text part way through, with blank lines."""
+    lines = []
+    for i in range(40):
+        lines.append(f"12/3/2025 9:{i // 6:02d}:{i % 6 * 10:02d} AM.{i:07d},{650 + i * 0.25},0x400c0")
+        if i % 9 == 0:
+            lines.append("")
+    lines.insert(30, "12/3/2025 9:04:05 AM.0000000,I/O Timeout,0x100400c0")
+    lines.insert(12, "##ERROR##,1.5,0x400c0")
+    with open(path, "w", newline="") as handle:
+        handle.write("\r\n".join(lines) + "\r\n")
+    return path
+
+
+@pytest.fixture(scope="module")
+def datasets(tmp_path_factory):
+    """Named lists of input files."""
+    directory = tmp_path_factory.mktemp("exports")
+
+    def export(name, rows, **kwargs):
+        return synthetic.write_export(str(directory / name), rows, start="2025-12-03 09:00:00", **kwargs)
+
+    return {
+        "samples": SAMPLE_FILES,
+        "clean": [export("clean.csv", 2000)],
+        "messy": [export("messy.csv", 2000, unsorted=0.05, duplicates=0.3, malformed=0.02,
+                         bad_quality=0.05, seed=1)],
+        "several": [export("a.csv", 900, duplicates=0.2, malformed=0.01, seed=2),
+                    export("b.csv", 1100, interval=1.7, unsorted=0.02, seed=3),
+                    export("c.csv", 700, interval=3.1, duplicates=0.5, seed=4)],
+        "text": [write_text_value_export(str(directory / "text.csv"))],
+    }
+
+
+@pytest.fixture(params=[True, False], ids=["pyarrow", "pandas"])
+def reader(request, monkeypatch):
+    """Run a test with pyarrow's reader and with the pandas C parser."""
+    if request.param and not core.HAVE_PYARROW:
+        pytest.skip("pyarrow is not installed")
+    monkeypatch.setattr(core, "HAVE_PYARROW", request.param)
+
+
+def written(tmp_path, name, write):
+    """Bytes of the file write(path) produces."""
+    path = str(tmp_path / name)
+    write(path)
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+def expected_bytes(tmp_path, file_paths, settings):
+    reference = baseline_convert(baseline_load(file_paths), **settings)
+    return written(tmp_path, "expected.csv",
+                   lambda path: reference.to_csv(path, index=False, header=False, encoding="cp1252"))
+
+
+@pytest.mark.parametrize("settings", OPTION_SETS)
+@pytest.mark.parametrize("name", ["samples", "clean", "messy", "several", "text"])
+@pytest.mark.parametrize("chunksize", [31, core.DEFAULT_CHUNKSIZE])
+def test_convert_frame_matches_baseline(tmp_path, datasets, reader, name, settings, chunksize):
+    file_paths = datasets[name]
+    df = core.load_files(file_paths, chunksize=chunksize)
+    converted, stats = core.convert_frame(df, core.ConversionOptions(**settings), ordered=True)
+    got = written(tmp_path, "got.csv", lambda path: core.write_chunks(
+        core.iter_frame_chunks(converted, chunksize), path))
+    assert got == expected_bytes(tmp_path, file_paths, settings)
+    assert stats.rows_out == len(converted)
+
+
+@pytest.mark.parametrize("settings", OPTION_SETS)
+@pytest.mark.parametrize("name", ["samples", "messy", "several", "text"])
+@pytest.mark.parametrize("chunksize", [31, 250])
+def test_convert_files_matches_baseline(tmp_path, datasets, name, settings, chunksize):
+    file_paths = datasets[name]
+    got = written(tmp_path, "got.csv", lambda path: core.convert_files(
+        file_paths, path, core.ConversionOptions(**settings), chunksize=chunksize))
+    assert got == expected_bytes(tmp_path, file_paths, settings)
+
+
+def test_convert_frame_with_stage_cache_matches_uncached(datasets):
+    df = core.load_files(datasets["messy"])
+    cache = core.StageCache()
+    for settings in OPTION_SETS + OPTION_SETS[::-1]:
+        options = core.ConversionOptions(**settings)
+        cached, cached_stats = core.convert_frame(df, options, cache=cache, ordered=True)
+        plain, plain_stats = core.convert_frame(df, options)
+        assert cached.equals(plain)
+        assert cached_stats.summary() == plain_stats.summary()
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 5, 1000])
+def test_text_value_resume_reads_each_row_once(datasets, reader, chunksize):
+    path = datasets["text"][0]
+    expected = pd.read_csv(path, header=None, names=core.OPC_COLUMNS)
+    reader_chunks = core._read_batches if core.HAVE_PYARROW else core._read_chunks
+    got = core.concat_frames(list(reader_chunks(path, chunksize)))
+    assert len(got) == len(expected)
+    assert got["Value"].astype(str).tolist() == expected["Value"].astype(str).tolist()
+    assert got["Timestamp"].tolist() == expected["Timestamp"].tolist()
+
+
+def test_parse_cache_round_trip(tmp_path, datasets):
+    cache = core.ParseCache(str(tmp_path / "cache"))
+    os.makedirs(cache.directory)
+    for path in datasets["messy"] + datasets["text"]:
+        parsed = core.load_files([path], cache=cache)
+        assert core.load_files([path], cache=cache).equals(parsed)
+
+
+def test_ordered_range_filter_matches_full_mask():
+    seconds = np.array([1, 2, 2, 0, 3, 4, 4, 0, 0, 5, 6, 7, 7, 8], dtype="int64")
+    nanos = np.where(seconds == 0, core.NAT_NANOS, seconds * core.NANOS_PER_SECOND)
+    df = pd.DataFrame({"Value": np.arange(len(nanos), dtype="float64"),
+                       core.PARSED: nanos.view("datetime64[ns]")})
+    for start in (None, 0, 2, 3, 5, 9):
+        for end in (None, 0, 2, 4, 7, 9):
+            options = core.ConversionOptions(
+                start=None if start is None else pd.Timestamp(start * core.NANOS_PER_SECOND),
+                end=None if end is None else pd.Timestamp(end * core.NANOS_PER_SECOND))
+            for chunksize in (1, 3, len(df)):
+                results = []
+                for ordered in (False, True):
+                    stats = core.ConversionStats()
+                    kept = pd.concat(list(core.filter_range(core.iter_frame_chunks(df, chunksize), options,
+                                                            stats, ordered)), ignore_index=True)
+                    results.append((kept["Value"].tolist(), stats.rows_filtered))
+                assert results[0] == results[1], (start, end, chunksize)
+
+
+def test_remove_duplicates_out_of_order_stream():
+    nanos = np.array([5, 3, 5, 1, 3, 9, 1, 7], dtype="int64") * core.NANOS_PER_SECOND
+    df = pd.DataFrame({
+        "Timestamp": pd.Categorical([None] * len(nanos)),
+        "Value": np.arange(len(nanos), dtype="float64"),
+        core.PARSED: nanos.view("datetime64[ns]"),
+    })
+    stats = core.ConversionStats()
+    kept = pd.concat(list(core.remove_duplicates(core.iter_frame_chunks(df, 3), stats)), ignore_index=True)
+    assert kept["Value"].tolist() == [0.0, 1.0, 3.0, 5.0, 7.0]
+    assert stats.duplicates_removed == 3
+
+
+def test_format_pi_timestamps_matches_strftime():
+    parsed = pd.Series(pd.to_datetime(
+        [None, "2024-02-29 23:59:59.9", "1999-12-31 00:00:00", None, "2025-01-01 12:00:01"
+    ], format="ISO8601")).astype("datetime64[ns]")
+    expected = parsed.dt.strftime(core.PI_FORMAT)
+    got = core.format_pi_timestamps(parsed)
+    assert got[parsed.notna()].tolist() == expected[parsed.notna()].tolist()
+    assert got.tolist()[0] is None and got.tolist()[3] is None
+
+
+def downsampled(df, chunksize, **settings):
+    options = core.ConversionOptions(**settings)
+    stats = core.ConversionStats()
+    chunks = core.run_pipeline(core.iter_frame_chunks(df, chunksize), options, stats, ordered=True)
+    return core.output_frame(pd.concat(list(chunks), ignore_index=True)), stats
+
+
+@pytest.mark.parametrize("method", ["first", "last", "mean", "min", "max"])
+def test_bucket_downsampling_matches_pandas(datasets, method):
+    df = core.load_files(datasets["clean"])
+    got, _ = downsampled(df, 97, downsample=method, downsample_seconds=60)
+
+    frame = core.output_frame(next(core.apply_offset([df], core.ConversionOptions())))
+    times = pd.to_datetime(frame["Timestamp"], format="%d-%b-%Y %H:%M:%S")
+    groups = frame.groupby(times.dt.floor("60s"), sort=True)["Value"]
+    if method == "mean":
+        expected = groups.mean()
+        assert got["Timestamp"].tolist() == [t.strftime(core.PI_FORMAT) for t in expected.index]
+    else:
+        expected = getattr(groups, method)()
+    assert np.allclose(got["Value"].to_numpy(dtype="float64"), expected.to_numpy())
+
+
+@pytest.mark.parametrize("method", core.DOWNSAMPLE_METHODS)
+def test_downsampling_does_not_depend_on_chunk_size(datasets, method):
+    df = core.load_files(datasets["messy"] + datasets["text"])
+    settings = {"downsample": method, "downsample_seconds": 30, "deviation": 0.05}
+    whole, whole_stats = downsampled(df, len(df), **settings)
+    for chunksize in (13, 400):
+        got, stats = downsampled(df, chunksize, **settings)
+        assert got.equals(whole)
+        assert stats.rows_downsampled == whole_stats.rows_downsampled
+
+
+def test_downsampling_keeps_passed_through_rows_in_place(tmp_path):
+    path = tmp_path / "passed.csv"
+    path.write_text(
+        "12/3/2025 5:28:12 AM.1,1.5,0x0\n"
+        "12/3/2025 5:28:13 AM.1,I/O Timeout,0x0\n"
+        "##ERROR##,2,0x0\n"
+        "12/3/2025 5:28:14 AM.1,3.5,0x0\n"
+        "12/3/2025 5:29:14 AM.1,4.5,0x0\n"
+    )
+    df = core.load_files([str(path)])
+    got, _ = downsampled(df, 2, downsample="mean", downsample_seconds=60)
+    assert got["Timestamp"].tolist() == [
+        "03-Dec-2025 05:28:00", "03-Dec-2025 05:28:13", "##ERROR##", "03-Dec-2025 05:29:00"]
+    got, _ = downsampled(df, 2, downsample="first", downsample_seconds=60)
+    assert got["Timestamp"].tolist() == ["03-Dec-2025 05:28:12", "##ERROR##", "03-Dec-2025 05:29:14"]
@@ -2,13 +2,176 @@
 """
 Timestamp Converter Application
 Converts US format timestamps in CSV files to DD-Mon-YYYY HH:MM:SS format.
+
+Run without arguments to open the GUI, or pass files/globs to convert them
+in batch mode (see --help).
+
+The conversion engine (and with it pandas/numpy) is imported by load_core()
+on first use rather than at module load, so the window appears immediately.
 """
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from datetime import datetime, timedelta
-import pandas as pd
+import argparse
+import cProfile
+import glob
+import json
 import os
+import queue
+import signal
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+core = None  # converter_core, imported by load_core()
+
+# Preview rows materialized in a treeview at once, and how close the view may
+# scroll to either end of that block before it is re-centered.
+PREVIEW_BLOCK_ROWS = 300
+PREVIEW_MARGIN_ROWS = 50
+# Rows sampled to estimate preview column widths
+WIDTH_SAMPLE_ROWS = 1000
+# How often the mainloop checks on a background job (milliseconds)
+WORKER_POLL_MS = 100
+# Watch mode: record of converted files, kept in the output folder
+WATCH_STATE_FILE = ".timestamp_converter_state.json"
+
+
+def load_core():
+    """Import the conversion engine on first use and return it.
+
+    Importing pandas dominates startup, so the GUI shows its window first and
+    warms the import up in the background. Safe to call from any thread.
+    """
+    global core
+    if core is None:
+        import converter_core
+        core = converter_core
+    return core
+
+
+class PagedTreeview:
+    """Treeview that only holds a window of a dataframe's rows.
+
+    A block of rows around the visible area is inserted into the tree; the
+    scrollbar spans the whole dataframe and the block is rebuilt as the view
+    nears its edges, so preview cost does not grow with the row count.
+    """
+
+    def __init__(self, tree, v_scroll):
+        self.tree = tree
+        self.v_scroll = v_scroll
+        self.df = None
+        self.columns = []
+        self.formatter = None
+        self.block_start = 0
+        self.block_end = 0
+        self._moving = False
+
+        tree.configure(yscrollcommand=self._on_tree_scrolled)
+        v_scroll.config(command=self._on_scrollbar)
+
+    def set_data(self, df, columns, formatter=None):
+        """Show df (restricted to columns) starting from the first row.
+
+        formatter, if given, turns a slice of df into the frame to display.
+        """
+        self.df = df
+        self.columns = columns
+        self.formatter = formatter
+        self._materialize(0)
+        self.tree.yview_moveto(0)
+
+    def clear(self):
+        """Remove all rows."""
+        self.df = None
+        self.tree.delete(*self.tree.get_children())
+        self.block_start = self.block_end = 0
+        self.v_scroll.set(0, 1)
+
+    def _materialize(self, start):
+        """Insert the block of rows beginning at start (clamped to the data)."""
+        total = len(self.df)
+        start = max(0, min(start, total - PREVIEW_BLOCK_ROWS))
+        end = min(total, start + PREVIEW_BLOCK_ROWS)
+        self.tree.delete(*self.tree.get_children())
+        block = self.df.iloc[start:end]
+        if self.formatter is not None:
+            block = self.formatter(block)
+        rows = block[self.columns].astype(str).values.tolist()
+        for row in rows:
+            self.tree.insert("", tk.END, values=row)
+        self.block_start, self.block_end = start, end
+
+    def _show(self, top):
+        """Scroll so the absolute row index top is the first visible row."""
+        if self.df is None or len(self.df) == 0:
+            return
+        top = max(0, min(int(top), len(self.df) - 1))
+        if top < self.block_start or top + self._visible_rows() > self.block_end:
+            self._materialize(top - PREVIEW_MARGIN_ROWS)
+        self._moving = True
+        try:
+            self.tree.yview_moveto((top - self.block_start) / max(1, self.block_end - self.block_start))
+        finally:
+            self._moving = False
+        self._update_scrollbar()
+
+    def _recenter(self, top):
+        """Rebuild the block around top if that moves it; otherwise just sync."""
+        start = max(0, min(top - PREVIEW_MARGIN_ROWS, len(self.df) - PREVIEW_BLOCK_ROWS))
+        if start == self.block_start:
+            self._update_scrollbar()
+            return
+        self._materialize(start)
+        self._show(top)
+
+    def _visible_rows(self):
+        """Number of rows currently visible in the tree."""
+        first, last = self.tree.yview()
+        return max(1, round((last - first) * (self.block_end - self.block_start)))
+
+    def _top_row(self):
+        """Absolute index of the first visible row."""
+        first, _ = self.tree.yview()
+        return self.block_start + round(first * (self.block_end - self.block_start))
+
+    def _update_scrollbar(self):
+        """Size the scrollbar thumb against the whole dataframe."""
+        total = len(self.df) if self.df is not None else 0
+        if total == 0:
+            self.v_scroll.set(0, 1)
+            return
+        top = self._top_row()
+        self.v_scroll.set(top / total, min(1.0, (top + self._visible_rows()) / total))
+
+    def _on_scrollbar(self, *args):
+        """Handle scrollbar drags, arrow clicks and page clicks."""
+        if self.df is None:
+            return
+        if args[0] == "moveto":
+            self._show(float(args[1]) * len(self.df))
+        elif args[0] == "scroll":
+            step = self._visible_rows() if args[2] == "pages" else 1
+            self._show(self._top_row() + int(args[1]) * step)
+
+    def _on_tree_scrolled(self, first, last):
+        """Track scrolling done by the tree itself (mouse wheel, keyboard)."""
+        if self.df is None or self._moving:
+            return
+        top = self._top_row()
+        bottom = top + self._visible_rows()
+        near_start = top - self.block_start < PREVIEW_MARGIN_ROWS and self.block_start > 0
+        near_end = self.block_end - bottom < PREVIEW_MARGIN_ROWS and self.block_end < len(self.df)
+        if near_start or near_end:
+            self._recenter(top)
+        else:
+            self._update_scrollbar()
+
+
 class TimestampConverterApp:
     def __init__(self, root):
         """Initialize the application with the main window."""
@@ -21,6 +184,11 @@ class TimestampConverterApp:
         self.converted_df = None
         self.previous_tagname_option = "None"  # Track previous selection
         self._first_filename = ""  # Store first uploaded filename for tagname default
+        self._worker = None  # Background load/apply/save job, if one is running
+        self.stage_cache = None  # core.StageCache of intermediate Apply results, made on load
+        self.parse_cache = None  # core.ParseCache of parsed input files, made on first load
+        self._cancel_event = None
+        self.last_timings = []  # core.StageTiming list of the last load/convert/save
 
         self.setup_ui()
 
@@ -52,8 +220,8 @@ class TimestampConverterApp:
         left_controls = ttk.Frame(main_frame)
         left_controls.grid(row=3, column=0, sticky="ew", padx=(0, 10), pady=10)
 
-        upload_btn = ttk.Button(left_controls, text="Upload CSV Files", command=self.upload_csv)
-        upload_btn.pack(side=tk.LEFT)
+        self.upload_btn = ttk.Button(left_controls, text="Upload CSV Files", command=self.upload_csv)
+        self.upload_btn.pack(side=tk.LEFT)
 
         ttk.Label(left_controls, text="  Hour offset:").pack(side=tk.LEFT, padx=(10, 5))
         self.offset_var = tk.StringVar(value="0")
@@ -117,24 +285,54 @@ class TimestampConverterApp:
         # Filter controls above the converted treeview
         filter_frame = ttk.Frame(main_frame)
         filter_frame.grid(row=1, column=1, sticky="ew", padx=(10, 0), pady=(0, 5))
+        range_frame = ttk.Frame(filter_frame)
+        range_frame.pack(fill=tk.X)
 
         # Start filter
         self.start_filter_var, self.start_date_var, self.start_time_var, \
             self.start_date_entry, self.start_time_entry = \
-            self._create_filter_row(filter_frame, "Start:", "01-Jan-2025", "00:00:00")
+            self._create_filter_row(range_frame, "Start:", "01-Jan-2025", "00:00:00")
 
         # Spacer
-        ttk.Label(filter_frame, text="   ").pack(side=tk.LEFT)
+        ttk.Label(range_frame, text="   ").pack(side=tk.LEFT)
 
         # End filter
         self.end_filter_var, self.end_date_var, self.end_time_var, \
             self.end_date_entry, self.end_time_entry = \
-            self._create_filter_row(filter_frame, "End:", "31-Dec-2025", "23:59:59")
+            self._create_filter_row(range_frame, "End:", "31-Dec-2025", "23:59:59")
+
+        # Downsampling below the range filter
+        downsample_frame = ttk.Frame(filter_frame)
+        downsample_frame.pack(fill=tk.X, pady=(5, 0))
+
+        ttk.Label(downsample_frame, text="Downsample:").pack(side=tk.LEFT, padx=(0, 5))
+        self.downsample_var = tk.StringVar(value="None")
+        self.downsample_combo = ttk.Combobox(
+            downsample_frame,
+            textvariable=self.downsample_var,
+            values=["None"],
+            state="readonly",
+            width=13
+        )
+        # Method names come from the engine, which is imported after the window opens
+        self.downsample_combo.configure(postcommand=lambda: self.downsample_combo.configure(
+            values=["None"] + load_core().DOWNSAMPLE_METHODS
+        ))
+        self.downsample_combo.pack(side=tk.LEFT)
+
+        ttk.Label(downsample_frame, text="  Interval (s):").pack(side=tk.LEFT, padx=(5, 5))
+        self.downsample_seconds_var = tk.StringVar(value="")
+        ttk.Entry(downsample_frame, textvariable=self.downsample_seconds_var, width=7).pack(side=tk.LEFT)
+
+        ttk.Label(downsample_frame, text="  Deviation:").pack(side=tk.LEFT, padx=(5, 5))
+        self.deviation_var = tk.StringVar(value="")
+        ttk.Entry(downsample_frame, textvariable=self.deviation_var, width=7).pack(side=tk.LEFT)
 
         # Highlight Apply button when any filter option changes
         for var in (self.start_filter_var, self.end_filter_var,
                     self.start_date_var, self.end_date_var,
-                    self.start_time_var, self.end_time_var):
+                    self.start_time_var, self.end_time_var,
+                    self.downsample_var, self.downsample_seconds_var, self.deviation_var):
             var.trace_add("write", lambda *_: self._highlight_apply())
 
         # Converted data treeview with scrollbars (below filters)
@@ -160,8 +358,8 @@ class TimestampConverterApp:
         )
         encoding_combo.pack(side=tk.LEFT, padx=(5, 0))
 
-        download_btn = ttk.Button(right_controls, text="Download Converted CSV", command=self.download_csv)
-        download_btn.pack(side=tk.RIGHT)
+        self.download_btn = ttk.Button(right_controls, text="Download Converted CSV", command=self.download_csv)
+        self.download_btn.pack(side=tk.RIGHT)
 
         # Status bar with row counts
         status_frame = ttk.Frame(main_frame)
@@ -180,8 +378,16 @@ class TimestampConverterApp:
         right_count_label = ttk.Label(status_frame, textvariable=self.right_count_var, relief=tk.SUNKEN, anchor="center", width=20)
         right_count_label.grid(row=0, column=2, sticky="ew", padx=(2, 0))
 
+        # Progress and cancel for background jobs
+        self.progress_bar = ttk.Progressbar(status_frame, mode="determinate", maximum=100, length=150)
+        self.progress_bar.grid(row=0, column=3, sticky="ew", padx=(2, 0))
+        self.cancel_btn = ttk.Button(status_frame, text="Cancel", command=self.cancel_job, state="disabled")
+        self.cancel_btn.grid(row=0, column=4, padx=(2, 0))
+        self.timings_btn = ttk.Button(status_frame, text="Timings", command=self.show_timings)
+        self.timings_btn.grid(row=0, column=5, padx=(2, 0))
+
     def create_treeview(self, parent):
-        """Create a treeview widget with scrollbars."""
+        """Create a paged treeview widget with scrollbars."""
         # Frame for treeview and scrollbars
         tree_frame = ttk.Frame(parent)
         tree_frame.grid(row=0, column=0, sticky="nsew")
@@ -193,9 +399,8 @@ class TimestampConverterApp:
         h_scroll = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL)
 
         # Treeview
-        tree = ttk.Treeview(tree_frame, yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
+        tree = ttk.Treeview(tree_frame, xscrollcommand=h_scroll.set)
 
-        v_scroll.config(command=tree.yview)
         h_scroll.config(command=tree.xview)
 
         # Grid layout
@@ -203,7 +408,7 @@ class TimestampConverterApp:
         v_scroll.grid(row=0, column=1, sticky="ns")
         h_scroll.grid(row=1, column=0, sticky="ew")
 
-        return tree
+        return PagedTreeview(tree, v_scroll)
 
     def on_tagname_option_changed(self, event=None):
         """Show/hide custom tagname entry based on selection."""
@@ -256,15 +461,6 @@ class TimestampConverterApp:
         date_entry.configure(state=state)
         time_entry.configure(state=state)
 
-    def _parse_filter_datetime(self, date_str, time_str, default_time):
-        """Parse date (DD-Mon-YYYY) and time (HH:MM:SS) strings into a datetime."""
-        date = datetime.strptime(date_str.strip(), "%d-%b-%Y").date()
-        try:
-            t = datetime.strptime(time_str.strip(), "%H:%M:%S").time()
-        except ValueError:
-            t = datetime.strptime(default_time, "%H:%M:%S").time()
-        return datetime.combine(date, t)
-
     def apply_conversion(self):
         """Apply conversion settings and update the preview panel."""
         self._unhighlight_apply()
@@ -272,134 +468,121 @@ class TimestampConverterApp:
             messagebox.showwarning("Warning", "No data loaded. Please upload CSV files first.")
             return
 
+        options = self._read_options()
+        if options is None:
+            return
+
+        source_df = self.original_df
+        cache = self.stage_cache
+
+        def on_done(result):
+            self.converted_df, stats = result
+
+            # Update display
+            preview_timing = core.StageTiming("preview", rows_in=stats.rows_out)
+            start = time.perf_counter()
+            columns = [col for col in self.converted_df.columns if col != core.PARSED]
+            self.populate_treeview(self.converted_tree, self.converted_df, columns, core.output_frame)
+            preview_timing.stop(start, stats.rows_out)
+            timing_msg = self._record_timings("convert", stats.stages + [preview_timing], **stats.counters())
+
+            # Update status and row counts
+            self.right_count_var.set(f"Converted: {stats.rows_out} rows")
+            self.status_var.set(f"Preview updated - {stats.summary(options.hour_offset)} ({timing_msg})")
+
+        self._run_in_background(
+            "Converting",
+            lambda progress, cancel: core.convert_frame(source_df, options, progress, cancel, cache, ordered=True),
+            on_done,
+            "Failed to convert data",
+        )
+
+    def _read_options(self):
+        """Collect conversion options from the UI, or None if any are invalid."""
         try:
             hour_offset = int(self.offset_var.get())
         except ValueError:
             messagebox.showerror("Error", "Hour offset must be a valid integer (e.g., -5, 0, +3)")
-            return
+            return None
 
         # Determine tagname
-        tagname_option = self.tagname_option_var.get()
         tagname = None
-        if tagname_option == "Custom":
+        if self.tagname_option_var.get() == "Custom":
             tagname = self.custom_tagname_var.get().strip() or None
 
-        # Filter out bad quality rows
-        bad_quality_removed = 0
-        source_df = self.original_df
-        if self.remove_bad_quality_var.get() == 1:
-            original_count = len(source_df)
-            source_df = source_df[source_df["Quality"].astype(str).str.strip() != "0x100400c0"].reset_index(drop=True)
-            bad_quality_removed = original_count - len(source_df)
-
-        # Vectorized timestamp conversion
-        cleaned = source_df["Timestamp"].astype(str).str.strip().str.strip('"')
-        cleaned = cleaned.str.replace(r' ([AP]M)\.\d+', r' \1', regex=True)
-        parsed = pd.to_datetime(cleaned, format="%m/%d/%Y %I:%M:%S %p", errors="coerce")
-        if hour_offset != 0:
-            parsed = parsed + pd.Timedelta(hours=hour_offset)
-        converted_timestamps = parsed.dt.strftime("%d-%b-%Y %H:%M:%S")
-        # Keep original string for rows that failed to parse
-        failed = parsed.isna()
-        if failed.any():
-            converted_timestamps[failed] = source_df["Timestamp"][failed]
-
-        # Build output dataframe
-        if tagname:
-            self.converted_df = pd.DataFrame({
-                "Tagname": tagname,
-                "Timestamp": converted_timestamps,
-                "Value": source_df["Value"]
-            })
-        else:
-            self.converted_df = pd.DataFrame({
-                "Timestamp": converted_timestamps,
-                "Value": source_df["Value"]
-            })
-
-        # Apply time range filters
-        rows_filtered = 0
-        if self.start_filter_var.get() == 1 or self.end_filter_var.get() == 1:
-            pre_filter_count = len(self.converted_df)
-            parsed_ts = pd.to_datetime(
-                self.converted_df["Timestamp"], format="%d-%b-%Y %H:%M:%S", errors="coerce"
-            )
-            mask = parsed_ts.notna()
-
-            if self.start_filter_var.get() == 1:
-                try:
-                    start_dt = self._parse_filter_datetime(
-                        self.start_date_var.get(), self.start_time_var.get(), "00:00:00"
-                    )
-                    mask = mask & (parsed_ts >= pd.Timestamp(start_dt))
-                except ValueError:
-                    messagebox.showerror("Error", "Invalid start date. Use DD-Mon-YYYY format (e.g. 01-Jan-2025)")
-                    return
-
-            if self.end_filter_var.get() == 1:
-                try:
-                    end_dt = self._parse_filter_datetime(
-                        self.end_date_var.get(), self.end_time_var.get(), "23:59:59"
-                    )
-                    mask = mask & (parsed_ts <= pd.Timestamp(end_dt))
-                except ValueError:
-                    messagebox.showerror("Error", "Invalid end date. Use DD-Mon-YYYY format (e.g. 31-Dec-2025)")
-                    return
-
-            self.converted_df = self.converted_df[mask].reset_index(drop=True)
-            rows_filtered = pre_filter_count - len(self.converted_df)
-
-        # Remove duplicate timestamps if checkbox is checked
-        duplicates_removed = 0
-        if self.remove_duplicates_var.get() == 1:
-            original_count = len(self.converted_df)
-            self.converted_df = self.converted_df.drop_duplicates(subset=["Timestamp"], keep="first").reset_index(drop=True)
-            duplicates_removed = original_count - len(self.converted_df)
-
-        # Update display
-        self.populate_treeview(self.converted_tree, self.converted_df)
-
-        # Update status and row counts
-        row_count = len(self.converted_df)
-        self.right_count_var.set(f"Converted: {row_count} rows")
-        offset_msg = f" (offset: {hour_offset:+d}h)" if hour_offset != 0 else ""
-        bad_msg = f", {bad_quality_removed} bad quality removed" if bad_quality_removed > 0 else ""
-        filter_msg = f", {rows_filtered} rows filtered out" if rows_filtered > 0 else ""
-        dup_msg = f", {duplicates_removed} duplicates removed" if duplicates_removed > 0 else ""
-        self.status_var.set(f"Preview updated - {row_count} rows converted{offset_msg}{bad_msg}{filter_msg}{dup_msg}")
-
-    def _parse_opc_timestamp(self, timestamp_str):
-        """Parse OPC server timestamp into a datetime object.
-
-        Input: "11/25/2025 2:02:03 PM.2390000" (MM/DD/YYYY H:MM:SS AM/PM.milliseconds)
-        Returns datetime object, or datetime.min if parsing fails.
-        """
-        try:
-            timestamp_str = str(timestamp_str).strip().strip('"')
-            if " AM." in timestamp_str:
-                timestamp_str = timestamp_str.split(" AM.")[0] + " AM"
-            elif " PM." in timestamp_str:
-                timestamp_str = timestamp_str.split(" PM.")[0] + " PM"
-            return datetime.strptime(timestamp_str, "%m/%d/%Y %I:%M:%S %p")
-        except ValueError:
-            return datetime.min
+        start = end = None
+        if self.start_filter_var.get() == 1:
+            try:
+                start = core.parse_filter_datetime(
+                    self.start_date_var.get(), self.start_time_var.get(), "00:00:00"
+                )
+            except ValueError:
+                messagebox.showerror("Error", "Invalid start date. Use DD-Mon-YYYY format (e.g. 01-Jan-2025)")
+                return None
+
+        if self.end_filter_var.get() == 1:
+            try:
+                end = core.parse_filter_datetime(
+                    self.end_date_var.get(), self.end_time_var.get(), "23:59:59"
+                )
+            except ValueError:
+                messagebox.showerror("Error", "Invalid end date. Use DD-Mon-YYYY format (e.g. 31-Dec-2025)")
+                return None
+
+        downsample = downsample_seconds = deviation = None
+        if self.downsample_var.get() != "None":
+            downsample = self.downsample_var.get()
+            try:
+                if self.downsample_seconds_var.get().strip():
+                    downsample_seconds = float(self.downsample_seconds_var.get())
+                if self.deviation_var.get().strip():
+                    deviation = float(self.deviation_var.get())
+            except ValueError:
+                messagebox.showerror("Error", "Downsampling interval and deviation must be numbers (e.g. 60, 0.5)")
+                return None
+            try:
+                core.check_downsample(downsample, downsample_seconds, deviation)
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return None
+
+        return core.ConversionOptions(
+            hour_offset=hour_offset,
+            tagname=tagname,
+            remove_bad_quality=self.remove_bad_quality_var.get() == 1,
+            remove_duplicates=self.remove_duplicates_var.get() == 1,
+            start=start,
+            end=end,
+            encoding=core.ENCODINGS[self.encoding_var.get()],
+            downsample=downsample,
+            downsample_seconds=downsample_seconds,
+            deviation=deviation,
+        )
 
-    def populate_treeview(self, tree, df):
-        """Populate a treeview with dataframe data."""
-        # Clear existing data
-        tree.delete(*tree.get_children())
+    def populate_treeview(self, view, df, columns=None, formatter=None):
+        """Populate a paged treeview with dataframe data."""
+        tree = view.tree
 
         # Set up columns
-        columns = list(df.columns)
+        columns = list(df.columns) if columns is None else list(columns)
         tree["columns"] = columns
         tree["show"] = "headings"
 
+        # Estimate widths from the first/last rows plus an even spread in between
+        if len(df) > WIDTH_SAMPLE_ROWS:
+            step = len(df) // WIDTH_SAMPLE_ROWS
+            sample = df.iloc[list(range(0, len(df), step)) + [len(df) - 1]]
+        else:
+            sample = df
+        if formatter is not None:
+            sample = formatter(sample)
+
         for col in columns:
             tree.heading(col, text=col)
             # Set column width based on content
             max_width = max(
                 len(str(col)),
-                df[col].astype(str).str.len().max() if len(df) > 0 else 0
+                sample[col].astype(str).str.len().max() if len(sample) > 0 else 0
             )
             # Ensure Timestamp column is wide enough to show full value
             if col == "Timestamp":
@@ -407,9 +590,127 @@ class TimestampConverterApp:
             else:
                 tree.column(col, width=min(max_width * 10, 300), minwidth=100)
 
-        # Insert data
-        for row in df.astype(str).values.tolist():
-            tree.insert("", tk.END, values=row)
+        # Insert only the rows around the visible area
+        view.set_data(df, columns, formatter)
+
+    def _run_in_background(self, label, work, on_done, error_message):
+        """Run work(progress, cancel) on a worker thread.
+
+        Progress is posted back to the mainloop through root.after and shown in
+        the status bar; on_done(result) runs on the mainloop when work returns.
+        """
+        if self._worker is not None:
+            return
+
+        messages = queue.Queue()
+        self._cancel_event = threading.Event()
+
+        def progress(done, total):
+            messages.put(("progress", done, total))
+
+        def target():
+            try:
+                load_core()  # Usually already warmed up by the time a job starts
+                profile_dir = os.environ.get(core.PROFILE_DIR_ENV)
+                if profile_dir:
+                    # Dump a cProfile of the job for performance reports
+                    profiler = cProfile.Profile()
+                    try:
+                        result = profiler.runcall(work, progress, self._cancel_event)
+                    finally:
+                        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+                        profiler.dump_stats(os.path.join(profile_dir, f"{label.lower()}-{stamp}.prof"))
+                else:
+                    result = work(progress, self._cancel_event)
+                messages.put(("done", result))
+            except Exception as e:
+                # core is still None here if the engine itself failed to import
+                if core is not None and isinstance(e, core.ConversionCancelled):
+                    messages.put(("cancelled",))
+                else:
+                    messages.put(("error", e))
+
+        self._worker = threading.Thread(target=target, daemon=True)
+        self._set_busy(True)
+        self.status_var.set(f"{label}...")
+        self._worker.start()
+        self.root.after(WORKER_POLL_MS, self._poll_worker, messages, label, on_done, error_message)
+
+    def _poll_worker(self, messages, label, on_done, error_message):
+        """Drain worker messages on the mainloop and reschedule until finished."""
+        while True:
+            try:
+                message = messages.get_nowait()
+            except queue.Empty:
+                self.root.after(WORKER_POLL_MS, self._poll_worker, messages, label, on_done, error_message)
+                return
+
+            kind = message[0]
+            if kind == "progress":
+                done, total = message[1], message[2]
+                if total:
+                    percent = 100 * done / total
+                    self.progress_bar["value"] = percent
+                    self.status_var.set(f"{label}... {percent:.0f}%")
+                continue
+
+            self._worker = None
+            self._set_busy(False)
+            if kind == "done":
+                on_done(message[1])
+            elif kind == "cancelled":
+                self.status_var.set(f"{label} cancelled")
+            else:
+                messagebox.showerror("Error", f"{error_message}:\n{str(message[1])}")
+                self.status_var.set(f"Error: {error_message.lower()}")
+            return
+
+    def _set_busy(self, busy):
+        """Toggle controls while a background job runs."""
+        state = "disabled" if busy else "normal"
+        for button in (self.upload_btn, self.apply_btn, self.download_btn):
+            button.configure(state=state)
+        self.cancel_btn.configure(state="normal" if busy else "disabled")
+        self.progress_bar["value"] = 0
+
+    def _record_timings(self, action, timings, **fields):
+        """Keep timings for the Timings window and log them if enabled. Returns a summary."""
+        self.last_timings = timings
+        log_path = os.environ.get(core.STATS_LOG_ENV)
+        if log_path:
+            try:
+                core.log_stats(log_path, action, timings, **fields)
+            except OSError as e:
+                print(f"Could not write stats log {log_path}: {e}", file=sys.stderr)
+        return core.timing_summary(timings)
+
+    def show_timings(self):
+        """Open a window listing per-stage time, rows and peak memory of the last job."""
+        window = tk.Toplevel(self.root)
+        window.title("Stage Timings")
+        columns = ("Stage", "Time (s)", "Rows in", "Rows out", "Peak memory (MB)")
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110, anchor="w" if col == "Stage" else "e")
+        for timing in self.last_timings:
+            peak = "" if timing.peak_bytes is None else f"{timing.peak_bytes / 2**20:.0f}"
+            tree.insert("", tk.END, values=(
+                timing.name, f"{timing.seconds:.3f}", timing.rows_in, timing.rows_out, peak
+            ))
+        if self.last_timings:
+            total = sum(timing.seconds for timing in self.last_timings)
+            tree.insert("", tk.END, values=("total", f"{total:.3f}", "", "", ""))
+        else:
+            tree.insert("", tk.END, values=("(no job has run yet)", "", "", "", ""))
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        ttk.Button(window, text="Close", command=window.destroy).pack(pady=(0, 10))
+
+    def cancel_job(self):
+        """Ask the running background job to stop at its next chunk."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self.status_var.set("Cancelling...")
 
     def upload_csv(self):
         """Handle multiple file upload (space-delimited OPC data or CSV)."""
@@ -421,36 +722,34 @@ class TimestampConverterApp:
         if not file_paths:
             return
 
-        try:
-            # Read and combine all selected files
-            dataframes = []
-            for file_path in file_paths:
-                # Read comma-delimited file without headers (OPC format)
-                # Format: 12/3/2025 5:28:11 AM.7480000,651.261902,0x400c0
-                df = pd.read_csv(
-                    file_path,
-                    header=None,
-                    names=["Timestamp", "Value", "Quality"]
-                )
-                dataframes.append(df)
+        def load(progress, cancel):
+            if self.parse_cache is None:
+                self.parse_cache = core.ParseCache()
+            timing = core.StageTiming("load")
+            start = time.perf_counter()
+            df = core.load_files(file_paths, progress, cancel, cache=self.parse_cache)
+            timing.stop(start, len(df))
+            timing.rows_in = len(df)
+            return df, timing
+
+        def on_done(result):
+            df, load_timing = result
+            self.original_df = df
+            self.stage_cache = core.StageCache()
 
             # Store first filename (without extension) for tagname default
-            self._first_filename = os.path.splitext(os.path.basename(file_paths[0]))[0]
-
-            # Concatenate all dataframes
-            self.original_df = pd.concat(dataframes, ignore_index=True)
-
-            # Sort by parsed timestamps
-            self.original_df = self.original_df.sort_values(
-                "Timestamp", key=lambda col: col.apply(self._parse_opc_timestamp)
-            ).reset_index(drop=True)
+            self._first_filename = core.default_tagname(file_paths[0])
 
             # Clear the converted preview (user must click Apply)
             self.converted_df = None
-            self.converted_tree.delete(*self.converted_tree.get_children())
+            self.converted_tree.clear()
 
             # Display original data
-            self.populate_treeview(self.original_tree, self.original_df)
+            preview_timing = core.StageTiming("preview", rows_in=len(df))
+            start = time.perf_counter()
+            self.populate_treeview(self.original_tree, self.original_df, core.OPC_COLUMNS, core.display_frame)
+            preview_timing.stop(start, len(df))
+            timing_msg = self._record_timings("load", [load_timing, preview_timing], files=list(file_paths))
 
             # Update status and row counts
             row_count = len(self.original_df)
@@ -459,13 +758,19 @@ class TimestampConverterApp:
             file_count = len(file_paths)
             if file_count == 1:
                 filename = os.path.basename(file_paths[0])
-                self.status_var.set(f"Loaded: {filename} - {row_count} rows. Click Apply to convert.")
+                self.status_var.set(f"Loaded: {filename} - {row_count} rows ({timing_msg}). Click Apply to convert.")
             else:
-                self.status_var.set(f"Loaded {file_count} files - {row_count} total rows. Click Apply to convert.")
+                self.status_var.set(
+                    f"Loaded {file_count} files - {row_count} total rows ({timing_msg}). Click Apply to convert."
+                )
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load files:\n{str(e)}")
-            self.status_var.set("Error loading files")
+        # Read, combine and sort all selected files
+        self._run_in_background(
+            "Loading",
+            load,
+            on_done,
+            "Failed to load files",
+        )
 
     def download_csv(self):
         """Handle converted CSV download."""
@@ -482,21 +787,445 @@ class TimestampConverterApp:
         if not file_path:
             return
 
-        try:
-            # Get selected encoding
-            encoding = "utf-8" if self.encoding_var.get() == "UTF-8" else "cp1252"
-            self.converted_df.to_csv(file_path, index=False, header=False, encoding=encoding)
-            self.status_var.set(f"Saved: {os.path.basename(file_path)} ({self.encoding_var.get()})")
+        # Get selected encoding
+        encoding_name = self.encoding_var.get()
+        encoding = core.ENCODINGS[encoding_name]
+        df = self.converted_df
+
+        def save(progress, cancel):
+            timing = core.StageTiming("write", rows_in=len(df))
+            start = time.perf_counter()
+            rows = core.write_chunks(core.iter_frame_chunks(df), file_path, encoding, progress, cancel, len(df))
+            timing.stop(start, rows)
+            return timing
+
+        def on_done(timing):
+            timing_msg = self._record_timings("save", [timing], output=file_path)
+            self.status_var.set(f"Saved: {os.path.basename(file_path)} ({encoding_name}, {timing_msg})")
             messagebox.showinfo("Success", f"File saved successfully:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save file:\n{str(e)}")
 
+        self._run_in_background(
+            "Saving",
+            save,
+            on_done,
+            "Failed to save file",
+        )
+
+
+def _parse_cli_datetime(value, default_time):
+    """Parse "DD-Mon-YYYY [HH:MM:SS]" from the command line.
+
+    Unlike the GUI fields, a time that is given must be valid; it is never
+    replaced by default_time.
+    """
+    date_str, _, time_str = value.strip().partition(" ")
+    try:
+        return datetime.strptime(f"{date_str} {time_str.strip() or default_time}", "%d-%b-%Y %H:%M:%S")
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid date '{value}'. Use DD-Mon-YYYY [HH:MM:SS] (e.g. 01-Jan-2025 06:00:00)"
+        )
+
+
+def build_parser():
+    """Build the argument parser for batch mode."""
+    parser = argparse.ArgumentParser(
+        description="Convert OPC server exports to PI tag import format (DD-Mon-YYYY HH:MM:SS)."
+    )
+    parser.add_argument("inputs", nargs="*", metavar="FILE",
+                        help="input files or glob patterns (e.g. 'exports/*.csv')")
+    parser.add_argument("-o", "--output-dir",
+                        help="directory for converted files (default: next to each input)")
+    parser.add_argument("--combine", metavar="OUTPUT",
+                        help="merge all inputs in time order into one OUTPUT file (like the GUI); "
+                             "with --tag-per-file, ordered by tag then time")
+    parser.add_argument("--suffix", default="_converted",
+                        help="appended to each input filename (default: %(default)s)")
+    parser.add_argument("--offset", type=int, default=0, metavar="HOURS",
+                        help="hour offset applied to every timestamp (e.g. -5)")
+    parser.add_argument("--tagname", help="tagname column written before each row")
+    parser.add_argument("--tag-per-file", action="store_true",
+                        help="use each input's filename as its tagname (like Tagname: Filename); "
+                             "files with the same name are merged into one tag")
+    parser.add_argument("--remove-bad-quality", action="store_true",
+                        help=f"drop rows with quality {core.BAD_QUALITY}")
+    parser.add_argument("--remove-duplicates", action="store_true",
+                        help="drop rows with a duplicate converted timestamp")
+    parser.add_argument("--start", type=lambda v: _parse_cli_datetime(v, "00:00:00"),
+                        metavar="'DD-Mon-YYYY [HH:MM:SS]'", help="drop rows before this time")
+    parser.add_argument("--end", type=lambda v: _parse_cli_datetime(v, "23:59:59"),
+                        metavar="'DD-Mon-YYYY [HH:MM:SS]'", help="drop rows after this time")
+    parser.add_argument("--downsample", choices=core.DOWNSAMPLE_METHODS, metavar="METHOD",
+                        help=f"reduce rows before writing: {', '.join(core.DOWNSAMPLE_METHODS)}")
+    parser.add_argument("--downsample-seconds", type=float, metavar="SECONDS",
+                        help="interval for first/last/mean/min/max/minmax; longest gap between "
+                             "kept rows for deadband/swinging-door")
+    parser.add_argument("--deviation", type=float, metavar="VALUE",
+                        help="deadband / compression deviation in value units")
+    parser.add_argument("--encoding", choices=list(core.ENCODINGS), default="ANSI",
+                        help="output encoding (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: %(default)s)")
+    parser.add_argument("--timings", action="store_true",
+                        help="print time, rows and peak memory of each pipeline stage")
+    parser.add_argument("--stats-log", metavar="FILE", default=os.environ.get(core.STATS_LOG_ENV),
+                        help=f"append a JSON line with stage timings per converted file "
+                             f"(default: ${core.STATS_LOG_ENV})")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="write a cProfile dump of the run to FILE (conversions then run "
+                             "in this process, one at a time)")
+    watch = parser.add_argument_group("watch mode")
+    watch.add_argument("--watch", metavar="DIR",
+                       help="keep running and convert new or changed files in DIR "
+                            "(output goes to --output-dir, default DIR/converted)")
+    watch.add_argument("--pattern", default="*.csv",
+                       help="files to pick up in the watched folder (default: %(default)s)")
+    watch.add_argument("--interval", type=float, default=5.0, metavar="SECONDS",
+                       help="how often the folder is scanned (default: %(default)s)")
+    watch.add_argument("--state", metavar="FILE",
+                       help=f"record of converted files (default: OUTPUT_DIR/{WATCH_STATE_FILE})")
+    return parser
+
+
+def _expand_inputs(patterns):
+    """Expand glob patterns (Windows shells do not) and drop repeated paths."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def _output_path(file_path, output_dir, suffix):
+    """Converted file path for one input: <stem><suffix><ext> in output_dir or next to it."""
+    stem, ext = os.path.splitext(os.path.basename(file_path))
+    return os.path.join(output_dir or os.path.dirname(file_path), f"{stem}{suffix}{ext or '.csv'}")
+
+
+def _path_key(path):
+    """Normalized absolute path, for telling whether two paths name the same file."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _skip_own_outputs(args, file_paths):
+    """Drop inputs that this run writes, e.g. *_converted.csv left by an earlier run of the same glob."""
+    if args.combine:
+        sources = {_path_key(args.combine): []}
+    elif args.tag_per_file:
+        sources = {_path_key(_output_path(paths[0], args.output_dir, args.suffix)): paths
+                   for paths in core.group_by_tag(file_paths).values()}
+    else:
+        sources = {_path_key(_output_path(path, args.output_dir, args.suffix)): [path] for path in file_paths}
+    kept = []
+    for path in file_paths:
+        writers = sources.get(_path_key(path))
+        # An input written over by its own job is refused later by _check_outputs()
+        if writers is not None and path not in writers:
+            print(f"{path}: skipped, it is an output of this run", file=sys.stderr)
+            continue
+        kept.append(path)
+    return kept
+
+
+def _check_outputs(parser, jobs):
+    """Exit with a usage error if a job would overwrite an input or another job's output."""
+    writers = {}
+    for label, (file_paths, output_path, _) in jobs.items():
+        key = _path_key(output_path)
+        if key in {_path_key(path) for path in file_paths}:
+            parser.error(f"{label} would be overwritten by its own output; use -o or a non-empty --suffix")
+        if key in writers:
+            parser.error(f"{writers[key]} and {label} would both be written to {output_path}; "
+                         "convert them in separate runs or use --combine")
+        writers[key] = label
+
+
+def _file_signature(file_path):
+    """(size, mtime in ns) used to tell whether a file changed."""
+    info = os.stat(file_path)
+    return [info.st_size, info.st_mtime_ns]
+
+
+def _load_watch_state(state_path):
+    """Read the watch state file; a missing or unreadable one starts empty."""
+    try:
+        with open(state_path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_watch_state(state_path, state):
+    """Write the watch state file atomically."""
+    temp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=1, sort_keys=True)
+    os.replace(temp_path, state_path)
+
+
+def _report_result(args, options, file_path, output_path, stats):
+    """Print a finished conversion and log its stage timings if requested."""
+    print(f"{file_path} -> {output_path}: {stats.summary(options.hour_offset)}")
+    if args.timings:
+        for timing in stats.stages:
+            peak = "" if timing.peak_bytes is None else f"  peak {timing.peak_bytes / 2**20:.0f} MB"
+            print(f"  {timing.name:<9} {timing.seconds:8.3f}s  {timing.rows_in:>10} -> {timing.rows_out:<10}{peak}")
+    if args.stats_log:
+        core.log_stats(args.stats_log, "convert", stats.stages,
+                       input=file_path, output=output_path, **stats.counters())
+
+
+def run_watch(args, options):
+    """Convert new or changed files in args.watch until interrupted. Returns the exit code.
+
+    The folder is polled every args.interval seconds. A file is queued once
+    its size and mtime have been unchanged for at least args.interval
+    seconds (so files still being written are left alone), and at most two
+    files per worker are in flight; the rest wait for a later scan. Finished files are recorded with their
+    signature in a JSON state file, so a restart skips them. Failed files are
+    recorded too and only retried once they change.
+    """
+    watch_dir = os.path.abspath(args.watch)
+    output_dir = os.path.abspath(args.output_dir or os.path.join(watch_dir, "converted"))
+    os.makedirs(output_dir, exist_ok=True)
+    state_path = args.state or os.path.join(output_dir, WATCH_STATE_FILE)
+    state = _load_watch_state(state_path)
+    jobs = max(1, args.jobs)
+    max_pending = 2 * jobs
+
+    last_seen = {}  # path -> (signature, when that signature was first seen)
+    pending = {}    # future -> (path, signature)
+    print(f"Watching {watch_dir} for {args.pattern} -> {output_dir} (Ctrl+C to stop)")
+    # Workers ignore Ctrl+C so in-flight files can finish while the watcher stops
+    with ProcessPoolExecutor(max_workers=jobs, initializer=signal.signal,
+                             initargs=(signal.SIGINT, signal.SIG_IGN)) as pool:
+        try:
+            while True:
+                in_flight = {path for path, _ in pending.values()}
+                outputs = {entry.get("output") for entry in state.values()}
+                seen = {}
+                now = time.monotonic()
+                for file_path in sorted(glob.glob(os.path.join(watch_dir, args.pattern))):
+                    try:
+                        signature = _file_signature(file_path)
+                    except OSError:
+                        continue  # removed between glob and stat
+                    previous, since = last_seen.get(file_path, (None, now))
+                    if previous != signature:
+                        since = now
+                    seen[file_path] = (signature, since)
+                    done = state.get(file_path)
+                    if (file_path in in_flight or file_path in outputs
+                            or now - since < args.interval
+                            or (done is not None and done["signature"] == signature)
+                            or len(pending) >= max_pending):
+                        continue
+                    output_path = _output_path(file_path, output_dir, args.suffix)
+                    file_options = options
+                    if args.tag_per_file:
+                        file_options = options.copy(tagname=core.default_tagname(file_path))
+                    future = pool.submit(core.convert_files, [file_path], output_path, file_options)
+                    pending[future] = (file_path, signature)
+                    in_flight.add(file_path)
+                last_seen = seen
+
+                if not pending:
+                    time.sleep(args.interval)
+                    continue
+                finished, _ = wait(pending, timeout=args.interval, return_when=FIRST_COMPLETED)
+                if not finished:
+                    continue
+                for future in finished:
+                    file_path, signature = pending.pop(future)
+                    output_path = _output_path(file_path, output_dir, args.suffix)
+                    try:
+                        stats = future.result()
+                    except Exception as e:
+                        print(f"{file_path}: failed - {e}", file=sys.stderr)
+                        state[file_path] = {"signature": signature, "error": str(e)}
+                        continue
+                    _report_result(args, options, file_path, output_path, stats)
+                    state[file_path] = {"signature": signature, "output": output_path}
+                _save_watch_state(state_path, state)
+        except KeyboardInterrupt:
+            print("Stopping; waiting for conversions in progress...")
+            for future in as_completed(pending):
+                file_path, signature = pending[future]
+                if future.exception() is None:
+                    state[file_path] = {"signature": signature,
+                                        "output": _output_path(file_path, output_dir, args.suffix)}
+            _save_watch_state(state_path, state)
+    return 0
+
+
+def _convert_each(jobs, workers):
+    """Run each (file_paths, output_path, options) job. Yields (label, stats or exception).
+
+    With more than one worker the jobs are spread across a process pool, one
+    job per worker; each worker streams its files in chunks.
+    """
+    if workers <= 1:
+        for label, (file_paths, output_path, options) in jobs.items():
+            try:
+                yield label, core.convert_files(file_paths, output_path, options)
+            except Exception as e:
+                yield label, e
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(core.convert_files, file_paths, output_path, options): label
+            for label, (file_paths, output_path, options) in jobs.items()
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def _run_jobs(args, options, jobs, shown_output=None):
+    """Run jobs, printing each result. Returns {label: stats} of the ones that succeeded.
+
+    shown_output replaces the job's own output path in messages and logs.
+    """
+    results = {}
+    workers = 1 if args.profile else max(1, min(args.jobs, len(jobs)))
+    for label, result in _convert_each(jobs, workers):
+        if isinstance(result, Exception):
+            print(f"{label}: failed - {result}", file=sys.stderr)
+            continue
+        _report_result(args, options, label, shown_output or jobs[label][1], result)
+        results[label] = result
+    return results
+
+
+def _run_tags(parser, args, options, file_paths):
+    """Convert one tag per filename, to a file per tag or one combined file. Returns the exit code.
+
+    Tags are converted concurrently, each merging its files in time order.
+    For --combine every tag is written to a part file first and the parts
+    are then streamed into the output in tag order, so the combined file is
+    ordered by tag then time without holding it in memory.
+    """
+    groups = core.group_by_tag(file_paths)
+    if not args.combine:
+        jobs = {
+            tag: (paths, _output_path(paths[0], args.output_dir, args.suffix), options.copy(tagname=tag))
+            for tag, paths in groups.items()
+        }
+        _check_outputs(parser, jobs)
+        results = _run_jobs(args, options, jobs)
+        return 0 if len(results) == len(jobs) else 1
+
+    output_dir = os.path.dirname(os.path.abspath(args.combine))
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix=".tags-") as part_dir:
+        jobs = {
+            tag: (paths, os.path.join(part_dir, f"{index:05d}.csv"), options.copy(tagname=tag))
+            for index, (tag, paths) in enumerate(groups.items())
+        }
+        results = _run_jobs(args, options, jobs, args.combine)
+        if len(results) < len(jobs):
+            print(f"{args.combine}: not written, {len(jobs) - len(results)} tags failed", file=sys.stderr)
+            return 1
+        total = core.ConversionStats()
+        for stats in results.values():
+            total.add(stats)
+        try:
+            core.concatenate_files([output_path for _, output_path, _ in jobs.values()], args.combine)
+        except OSError as e:
+            print(f"{args.combine}: failed - {e}", file=sys.stderr)
+            return 1
+    print(f"{len(jobs)} tags -> {args.combine}: {total.summary(options.hour_offset)}")
+    return 0
+
+
+def run_cli(argv):
+    """Convert files in batch mode, with a cProfile dump if requested. Returns the exit code."""
+    load_core()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.profile:
+        return _run_cli(parser, args)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(_run_cli, parser, args)
+    finally:
+        profiler.dump_stats(args.profile)
+        print(f"Profile written to {args.profile}")
+
+
+def _run_cli(parser, args):
+    """Convert files in batch mode across a process pool. Returns the exit code."""
+    if args.watch:
+        if args.inputs or args.combine:
+            parser.error("--watch takes no input files and cannot be combined with --combine")
+        file_paths = []
+    else:
+        file_paths = _skip_own_outputs(args, _expand_inputs(args.inputs))
+        if not file_paths:
+            parser.error("no input files matched")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    options = core.ConversionOptions(
+        hour_offset=args.offset,
+        tagname=args.tagname,
+        remove_bad_quality=args.remove_bad_quality,
+        remove_duplicates=args.remove_duplicates,
+        start=args.start,
+        end=args.end,
+        encoding=core.ENCODINGS[args.encoding],
+        downsample=args.downsample,
+        downsample_seconds=args.downsample_seconds,
+        deviation=args.deviation,
+    )
+    try:
+        core.check_downsample(args.downsample, args.downsample_seconds, args.deviation)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.tag_per_file and args.tagname:
+        parser.error("--tag-per-file and --tagname cannot be used together")
+
+    if args.watch:
+        return run_watch(args, options)
+
+    if args.tag_per_file:
+        return _run_tags(parser, args, options, file_paths)
+
+    if args.combine:
+        try:
+            stats = core.convert_files(file_paths, args.combine, options)
+        except Exception as e:
+            print(f"{args.combine}: failed - {e}", file=sys.stderr)
+            return 1
+        _report_result(args, options, f"{len(file_paths)} files", args.combine, stats)
+        return 0
+
+    # Each file is put in time order (sorted if need be), as the GUI does
+    jobs = {
+        file_path: ([file_path], _output_path(file_path, args.output_dir, args.suffix), options)
+        for file_path in file_paths
+    }
+    _check_outputs(parser, jobs)
+    results = _run_jobs(args, options, jobs)
+    return 0 if len(results) == len(jobs) else 1
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run_cli(argv)
 
-def main():
     root = tk.Tk()
     app = TimestampConverterApp(root)
+    # Import the engine once the window is up, so the first load doesn't wait for it
+    root.after_idle(lambda: threading.Thread(target=load_core, daemon=True).start())
     root.mainloop()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())